@@ -1,27 +1,337 @@
-class Enemy:
-    def __init__(self, x, y, enemy_type="basic"):
-        self.x, self.y = x, y
-        self.type = enemy_type
-        self.health = 100
-        self.speed = 1
-        self.detection_range = 5
-        self.state = "patrol"  # patrol, chase, search
-        
-    def update(self, player_pos, walls, obstacles):
-        if self.can_see_player(player_pos, walls):
-            self.state = "chase"
-            self.move_towards_player(player_pos)
+import numpy as np
+from settings import *
+from Helpers.constants import *
+from GameAI.line_of_sight import LineOfSight
+from GameAI.pathfinding import UNREACHABLE
+from GameActions.combat import TargetIndex
+
+# Enemy states, stored as small ints so transitions are array masks
+PATROL, CHASE, SEARCH = 0, 1, 2
+STATE_NAMES = ("patrol", "chase", "search")
+
+ENEMY_SIZE = SCALED_TILE_SIZE
+
+# Per-enemy arrays: name -> (extra dimensions, dtype)
+ENEMY_FIELDS = {
+    'position': ((2,), np.float32),        # top-left in world pixels
+    'old_position': ((2,), np.float32),    # position before the last step, for interpolated drawing
+    'velocity': ((2,), np.float32),        # pixels moved during the last step
+    'patrol_origin': ((2,), np.float32),
+    'last_seen': ((2,), np.float32),       # where the hero was last seen, searched when sight is lost
+    'health': ((), np.float32),
+    'speed': ((), np.float32),
+    'detection_range': ((), np.float32),   # pixels
+    'patrol_range': ((), np.float32),      # pixels either side of patrol_origin
+    'patrol_direction': ((), np.float32),  # -1 left, 1 right
+    'search_timer': ((), np.float32),
+    'state': ((), np.int8),
+    'type_index': ((), np.int16),
+    'alive': ((), bool),
+    'generation': ((), np.uint32)          # bumped when a slot is reused so stale handles can tell
+}
+
+class EnemySystem:
+    """
+    Every enemy of a level stored in contiguous arrays and updated in a few vectorized passes
+    Slots of dead enemies are reused by later spawns
+    """
+    def __init__(self, tile_map, line_of_sight=None, flow_field=None, capacity=64):
+        self.tile_map = tile_map
+        self.line_of_sight = line_of_sight or LineOfSight(tile_map)
+        self.flow_field = flow_field  # without one chasers head straight for the target
+        self._target_index = None  # built on the first attack after enemies move, spawn or die
+        self.count = 0  # slots in use, dead ones included
+        self.free_slots = []
+        self.type_names = list(ENEMY_TYPES)
+
+        for name, (shape, dtype) in ENEMY_FIELDS.items():
+            setattr(self, name, np.zeros((capacity,) + shape, dtype=dtype))
+
+        # One shared image per enemy type
+        self.images = []
+        for enemy_type in ENEMY_TYPES.values():
+            image = pygame.Surface((ENEMY_SIZE, ENEMY_SIZE))
+            image.fill(enemy_type["colour"])
+            self.images.append(image)
+
+    @property
+    def capacity(self):
+        return len(self.alive)
+
+    def _grow(self):
+        """Double every array, existing enemies keep their slots"""
+        capacity = self.capacity * 2
+        for name, (shape, dtype) in ENEMY_FIELDS.items():
+            grown = np.zeros((capacity,) + shape, dtype=dtype)
+            grown[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, grown)
+
+    # ==================== SPAWNING ====================
+    def spawn(self, pos, enemy_type="basic"):
+        """Add an enemy with its top-left at pos (world pixels), returns its handle"""
+        attributes = ENEMY_TYPES[enemy_type]
+        if self.free_slots:
+            index = self.free_slots.pop()
         else:
-            self.patrol()
-    
-    def can_see_player(self, player_pos, walls):
-        # Line-of-sight check
-        pass
-    
-    def move_towards_player(self, player_pos):
-        # Chase logic
-        pass
-    
-    def patrol(self):
-        # Patrol behavior
-        pass
+            if self.count == self.capacity:
+                self._grow()
+            index = self.count
+            self.count += 1
+
+        self.position[index] = self.old_position[index] = self.patrol_origin[index] = pos
+        self.last_seen[index] = pos
+        self.velocity[index] = 0
+        self.health[index] = attributes["health"]
+        self.speed[index] = attributes["speed"]
+        self.detection_range[index] = attributes["detection_range"] * SCALED_TILE_SIZE
+        self.patrol_range[index] = attributes["patrol_range"] * SCALED_TILE_SIZE
+        self.patrol_direction[index] = 1
+        self.search_timer[index] = 0
+        self.state[index] = PATROL
+        self.type_index[index] = self.type_names.index(enemy_type)
+        self.alive[index] = True
+        self.generation[index] += 1
+        self._target_index = None
+        return Enemy(self, index)
+
+    def spawn_from_objects(self, objects):
+        """Spawn an enemy for every TMX object named 'enemy', its enemy_type property picks the type"""
+        for obj in objects:
+            if obj.name == 'enemy':
+                enemy_type = (obj.properties or {}).get('enemy_type', 'basic')
+                self.spawn((obj.x * SCALE, obj.y * SCALE), enemy_type)
+
+    def damage(self, index, amount):
+        """Apply damage to one enemy, killing it at 0 health"""
+        self.damage_many(np.array([index]), amount)
+
+    def damage_many(self, indices, amount):
+        """Apply damage (one amount, or one per index) to many enemies at once, killing those that drop to 0 health"""
+        amount = np.broadcast_to(amount, indices.shape)
+        hit = self.alive[indices]
+        indices, amount = indices[hit], amount[hit]
+        if not len(indices):
+            return
+
+        # The same enemy may be hit more than once (e.g. a volley), add every hit up
+        np.subtract.at(self.health, indices, amount)
+        indices = np.unique(indices)
+        killed = indices[self.health[indices] <= 0]
+        if len(killed):
+            self.alive[killed] = False
+            self.velocity[killed] = 0
+            self.free_slots.extend(killed.tolist())
+            self._target_index = None
+
+    def handles(self):
+        """Handles for every living enemy"""
+        return [Enemy(self, index) for index in np.flatnonzero(self.alive[:self.count]).tolist()]
+
+    def target_index(self):
+        """Living enemies indexed by tile cell for attack hit lookups, reused until they next move"""
+        if self._target_index is None:
+            self._target_index = EnemyTargetIndex(self)
+        return self._target_index
+
+    @property
+    def alive_count(self):
+        return int(np.count_nonzero(self.alive[:self.count]))
+
+    # ==================== UPDATE ====================
+    def update(self, dt, target):
+        """Advance every enemy by one step of dt seconds towards/around the target (world pixel position)"""
+        count = self.count
+        if not count:
+            return
+
+        alive = self.alive[:count]
+        state = self.state[:count]
+        position = self.position[:count]
+        self.old_position[:count] = position
+        self._target_index = None
+        target = np.asarray(target, dtype=np.float32)
+
+        # Sight: alive, within detection range and not behind a wall
+        centres = position + ENEMY_SIZE / 2
+        sees = alive & self.can_see(centres, target)
+
+        # State transitions as masks
+        lost = (state == CHASE) & ~sees
+        state[sees] = CHASE
+        self.last_seen[:count][sees] = target
+        state[lost] = SEARCH
+        self.search_timer[:count][lost] = ENEMY_SEARCH_TIME
+
+        searching = state == SEARCH
+        self.search_timer[:count][searching] -= dt
+        give_up = searching & (self.search_timer[:count] <= 0)
+        state[give_up] = PATROL
+        self.patrol_origin[:count][give_up] = position[give_up]
+
+        # Velocities, speeds are tuned per frame at BASE_FRAME_RATE
+        frames = dt * BASE_FRAME_RATE
+        speed = self.speed[:count] * frames
+        velocity = self.velocity[:count]
+        velocity[:] = 0
+
+        patrolling = alive & (state == PATROL)
+        self._turn_at_patrol_edges(patrolling)
+        velocity[patrolling, 0] = self.patrol_direction[:count][patrolling] * speed[patrolling] * 0.5
+
+        hunting = alive & (state != PATROL)
+        goals = np.where((state == CHASE)[:, None], target, self.last_seen[:count])
+        if self.flow_field:
+            self.move_towards_player(alive & (state == CHASE), centres, goals)
+        to_goal = goals - centres
+        distance = np.hypot(to_goal[:, 0], to_goal[:, 1])
+        moving = hunting & (distance > speed)
+        velocity[moving] = to_goal[moving] / distance[moving, None] * speed[moving, None]
+
+        self._move(velocity, patrolling)
+
+    def can_see(self, centres, target):
+        """Mask of enemies close enough to notice the target with a clear line of sight to it"""
+        offset = target - centres
+        sees = np.hypot(offset[:, 0], offset[:, 1]) <= self.detection_range[:self.count]
+
+        # Rays are only cast for enemies in range, so their length is bounded by the detection range
+        in_range = np.flatnonzero(sees)
+        if len(in_range):
+            sees[in_range] = self.line_of_sight.visible_batch(centres[in_range], target)
+        return sees
+
+    def move_towards_player(self, chasing, centres, goals):
+        """Point chasers at the centre of the next tile along the shared flow field, O(1) per enemy"""
+        tiles = np.floor(centres / SCALED_TILE_SIZE).astype(np.int32)
+        direction, distance = self.flow_field.sample(tiles)
+
+        # Next to the target, or off the field (too far / walled off), head straight for the target
+        on_field = chasing & (distance != UNREACHABLE) & (distance > 1)
+        goals[on_field] = (tiles[on_field] + direction[on_field] + 0.5) * SCALED_TILE_SIZE
+
+    def _turn_at_patrol_edges(self, patrolling):
+        count = self.count
+        offset = self.position[:count, 0] - self.patrol_origin[:count, 0]
+        direction = self.patrol_direction[:count]
+        past_edge = patrolling & (np.abs(offset) >= self.patrol_range[:count]) & (np.sign(offset) == direction)
+        direction[past_edge] *= -1
+
+    def _move(self, velocity, patrolling):
+        """Move along each axis separately, cancelling the axis that would end up inside a solid tile"""
+        position = self.position[:self.count]
+        for axis in (0, 1):
+            moving = velocity[:, axis] != 0
+            if not moving.any():
+                continue
+            moved = position.copy()
+            moved[:, axis] += velocity[:, axis]
+
+            blocked = moving & self._blocked(moved)
+            position[:, axis] = np.where(blocked, position[:, axis], moved[:, axis])
+            velocity[blocked, axis] = 0
+            if axis == 0:
+                self.patrol_direction[:self.count][blocked & patrolling] *= -1
+
+    def _blocked(self, positions):
+        """Mask of enemy boxes at positions that overlap a solid tile or leave the map"""
+        solid = self.tile_map.solid
+        first = np.floor(positions / SCALED_TILE_SIZE).astype(np.int32)
+        last = np.floor((positions + ENEMY_SIZE - 1) / SCALED_TILE_SIZE).astype(np.int32)
+        outside = (first < 0).any(axis=1) | (last[:, 0] >= self.tile_map.width) | (last[:, 1] >= self.tile_map.height)
+
+        # A tile-sized box touches at most 2x2 tiles, check the four corners
+        left, top = np.clip(first[:, 0], 0, self.tile_map.width - 1), np.clip(first[:, 1], 0, self.tile_map.height - 1)
+        right, bottom = np.clip(last[:, 0], 0, self.tile_map.width - 1), np.clip(last[:, 1], 0, self.tile_map.height - 1)
+        return outside | solid[top, left] | solid[top, right] | solid[bottom, left] | solid[bottom, right]
+
+    # ==================== DRAWING ====================
+    def convert(self):
+        """Match the display pixel format (main thread only)"""
+        if pygame.display.get_surface():
+            self.images = [image.convert() for image in self.images]
+
+    def draw(self, surface, offset, alpha=1.0):
+        """Draw the living enemies on screen, blended between the last two steps, returns the (N, 4) screen rects drawn"""
+        count = self.count
+        if not count:
+            return np.zeros((0, 4), dtype=np.float32)
+
+        old_position = self.old_position[:count]
+        screen_position = old_position + (self.position[:count] - old_position) * alpha - np.asarray(offset, dtype=np.float32)
+        width, height = surface.get_size()
+        visible = (self.alive[:count]
+                   & (screen_position[:, 0] > -ENEMY_SIZE) & (screen_position[:, 0] < width)
+                   & (screen_position[:, 1] > -ENEMY_SIZE) & (screen_position[:, 1] < height))
+
+        images = self.images
+        surface.fblits([(images[type_index], position) for type_index, position in
+                        zip(self.type_index[:count][visible].tolist(), screen_position[visible].tolist())])
+
+        drawn = np.empty((int(visible.sum()), 4), dtype=np.float32)
+        drawn[:, :2] = screen_position[visible]
+        drawn[:, 2:] = ENEMY_SIZE
+        return drawn
+
+class EnemyTargetIndex(TargetIndex):
+    """TargetIndex over an EnemySystem, hit enemies get handles and damage is applied in one batch"""
+    def __init__(self, system):
+        self.system = system
+        self.indices = np.flatnonzero(system.alive[:system.count])
+        super().__init__(system.position[self.indices] + ENEMY_SIZE / 2, EnemyHandles(system, self.indices))
+
+    def take_damage(self, rows, damage):
+        self.system.damage_many(self.indices[rows], damage)
+
+class EnemyHandles:
+    """Row -> Enemy handle, created only for the enemies actually hit"""
+    def __init__(self, system, indices):
+        self.system = system
+        self.indices = indices
+
+    def __getitem__(self, row):
+        return Enemy(self.system, int(self.indices[row]))
+
+    def __len__(self):
+        return len(self.indices)
+
+class Enemy:
+    """Handle to one enemy in an EnemySystem, the enemy's data lives in the system's arrays"""
+    def __init__(self, system, index):
+        self.system = system
+        self.index = index
+        self.generation = int(system.generation[index])
+
+    @property
+    def alive(self):
+        """False once the enemy died (or its slot went to a newer enemy)"""
+        return bool(self.system.alive[self.index]) and self.system.generation[self.index] == self.generation
+
+    @property
+    def rect(self):
+        return pygame.FRect(self.system.position[self.index].tolist(), (ENEMY_SIZE, ENEMY_SIZE))
+
+    @property
+    def health(self):
+        return float(self.system.health[self.index])
+
+    @property
+    def state(self):
+        return STATE_NAMES[self.system.state[self.index]]
+
+    @property
+    def type(self):
+        return self.system.type_names[self.system.type_index[self.index]]
+
+    def can_see_player(self, player_pos):
+        """In detection range of player_pos (world pixels) with no wall in between"""
+        centre = (self.system.position[self.index] + ENEMY_SIZE / 2).tolist()
+        if not self.alive or pygame.Vector2(centre).distance_to(player_pos) > self.system.detection_range[self.index]:
+            return False
+        return self.system.line_of_sight.visible(centre, player_pos)
+
+    def take_damage(self, amount):
+        if self.alive:
+            self.system.damage(self.index, amount)
+
+    def __repr__(self):
+        return f"<Enemy {self.type} #{self.index} {self.state} hp={self.health:g}>"
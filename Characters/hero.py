@@ -1,11 +1,17 @@
 from settings import *
 from Helpers.constants import *
+from GameSystems.input import KeyboardInput
+from GameSystems.events import get_logger
+from GameSystems.profiler import PROFILER
+
+LOG = get_logger("hero")
 
 class Hero(pygame.sprite.Sprite):
-    def __init__(self, pos, groups, collision_groups):
-        super().__init__(groups)
+    def __init__(self, pos, groups, collision_groups, input_source=None):
+        super().__init__()
         self.collision_sprites = collision_groups
-        print(f"collision sprites: {self.collision_sprites}")
+        self.input_source = input_source or KeyboardInput()
+        LOG.debug("collision sprites: %s", self.collision_sprites)
         # Scale the surface from TMX (8x8 -> 24x24)
         # if surf:
         #     self.image = pygame.transform.scale(surf, (TILE_SIZE * SCALE, TILE_SIZE * SCALE))
@@ -20,6 +26,9 @@ class Hero(pygame.sprite.Sprite):
         self.rect = self.image.get_frect(topleft=scaled_pos)
         self.old_rect = self.rect.copy()
 
+        # Join groups only once the rect exists, spatially hashed groups bucket by it
+        self.add(groups)
+
         # Player-specific attributes
         self.direction = vector()
         self.speed = PLAYER_ATTRIBUTES["speed"]
@@ -28,8 +37,8 @@ class Hero(pygame.sprite.Sprite):
         self.touch_surface = False
 
     def handle_input(self):
-        # Get pressed keys for movement
-        keys = pygame.key.get_pressed()
+        # Get pressed keys for movement (live keyboard or a scripted source)
+        keys = self.input_source.get_pressed()
         input_vector = vector(0,0)
 
         if keys[pygame.K_LEFT] or keys[pygame.K_a]:
@@ -42,25 +51,33 @@ class Hero(pygame.sprite.Sprite):
                 self.jump = True
         self.direction.x = input_vector.normalize().x if input_vector else 0
 
-    def move(self):
+    def move(self, dt):
+        # Movement attributes are tuned per frame at BASE_FRAME_RATE, scale them to this step
+        frames = dt * BASE_FRAME_RATE
+
         # horizontal
-        self.rect.x += self.direction.x * self.speed
+        self.rect.x += self.direction.x * self.speed * frames
         self._check_collision('horizontal')
 
         # vertical
         if self.jump:
             self.touch_surface = False
             self.direction.y -= self.gravity * 8
-            self.rect.y += self.direction.y
+            self.rect.y += self.direction.y * frames
             self.jump = False
         
         # going down with gravity
-        self.direction.y += self.gravity / 2
-        self.rect.y += self.direction.y
+        self.direction.y += self.gravity / 2 * frames
+        self.rect.y += self.direction.y * frames
         self._check_collision('vertical')
 
     def _check_collision(self, axis):
-        for sprite in self.collision_sprites:
+        with PROFILER.scope("hero.collision"):
+            self._resolve_collision(axis)
+
+    def _resolve_collision(self, axis):
+        # Only sprites in the buckets around the player can collide with it
+        for sprite in self.collision_sprites.query(self.rect):
             if sprite.rect.colliderect(self.rect):
                 if axis == 'horizontal':
                     # player going left
@@ -79,7 +96,7 @@ class Hero(pygame.sprite.Sprite):
                         self.rect.top = sprite.rect.bottom
                     self.direction.y = 0
 
-    def update(self):
+    def update(self, dt):
         self.old_rect = self.rect.copy()
         self.handle_input()
-        self.move()
\ No newline at end of file
+        self.move(dt)
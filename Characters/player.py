@@ -5,6 +5,7 @@ from GameEnvironment.base import GameObject
 from GameEnvironment.environment import HealthBar
 from GameItems.weapons import WEAPONS
 from GameActions.combat import AttackHandler
+from GameSystems.events import EVENTS, InteractionEvent
 from Helpers.constants import *
 
 class Player(GameObject):
@@ -132,13 +133,13 @@ class Player(GameObject):
                 if objects:
                     success = self.interact_with_objects(objects)
                     if not success:
-                        print("Nothing to interact with nearby")
+                        EVENTS.emit(InteractionEvent("Player", "interact", "nothing nearby"))
             elif event.key == pygame.K_r:
                 # Another interaction key - maybe for examining objects
-                print("Examine action!")
+                EVENTS.emit(InteractionEvent("Player", "examine"))
             elif event.key == pygame.K_i:
                 # Open inventory
-                print("Opening inventory...")
+                EVENTS.emit(InteractionEvent("Inventory", "opened"))
         
         return False  # Return True if event should stop other processing
     
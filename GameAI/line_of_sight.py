@@ -0,0 +1,121 @@
+"""
+Line of sight over the level's tile solidity grid
+Rays walk the tiles they cross (DDA), so a check costs the ray's length in tiles, however many walls
+the level has. Rays run between tile centres, which makes every answer depend only on the source and
+target tiles and lets results be cached per (source tile, target tile) for the current tick.
+"""
+import numpy as np
+from settings import *
+
+def has_line_of_sight(solid, source_tile, target_tile):
+    """True if no solid tile lies between two tiles (the source tile itself is not checked)"""
+    return bool(cast_rays(solid, np.array([source_tile]), target_tile)[0])
+
+def cast_rays(solid, source_tiles, target_tile):
+    """
+    Visibility from many source tiles to one target tile in a single vectorized DDA
+    source_tiles is an (N, 2) array of x, y tiles, returns an (N,) bool array
+    """
+    height, width = solid.shape
+    source_tiles = np.asarray(source_tiles, dtype=np.int64).reshape(-1, 2)
+    target_tile = np.asarray(target_tile, dtype=np.int64)
+
+    cell = source_tiles.copy()
+    delta = target_tile - source_tiles
+    step = np.sign(delta)
+    distance = np.abs(delta)
+
+    # Boundaries crossed so far per axis. The next x boundary is at t = (2 * crossed_x + 1) / (2 * distance_x),
+    # comparing cross-multiplied integers keeps ties at tile corners exact
+    crossed = np.zeros_like(cell)
+    remaining = distance.sum(axis=1)
+    visible = np.ones(len(source_tiles), dtype=bool)
+
+    def solid_at(columns, rows, mask):
+        """Solidity of the given tiles where mask is set, tiles outside the map are open"""
+        inside = mask & (columns >= 0) & (columns < width) & (rows >= 0) & (rows < height)
+        result = np.zeros(len(mask), dtype=bool)
+        result[inside] = solid[rows[inside], columns[inside]]
+        return result
+
+    while True:
+        active = visible & (remaining > 0)
+        if not active.any():
+            break
+
+        next_x = (2 * crossed[:, 0] + 1) * distance[:, 1]
+        next_y = (2 * crossed[:, 1] + 1) * distance[:, 0]
+        along_x = active & (next_x < next_y)
+        along_y = active & (next_y < next_x)
+        corner = active & (next_x == next_y)
+
+        # Through a corner the ray squeezes between two tiles, it is only stopped if both are solid
+        pinched = solid_at(cell[:, 0] + step[:, 0], cell[:, 1], corner) & solid_at(cell[:, 0], cell[:, 1] + step[:, 1], corner)
+        visible &= ~pinched
+
+        moved_x = along_x | corner
+        moved_y = along_y | corner
+        cell[moved_x, 0] += step[moved_x, 0]
+        crossed[moved_x, 0] += 1
+        cell[moved_y, 1] += step[moved_y, 1]
+        crossed[moved_y, 1] += 1
+        remaining -= moved_x.astype(np.int64) + moved_y.astype(np.int64)
+
+        visible &= ~solid_at(cell[:, 0], cell[:, 1], active)
+
+    return visible
+
+class LineOfSight:
+    """Line of sight queries against a TileMap, cached per (source tile, target tile) until the next tick"""
+    def __init__(self, tile_map):
+        self.tile_map = tile_map
+        self.cache = {}  # (source_x, source_y, target_x, target_y) -> visible
+        self.rays_cast = 0
+
+    def new_tick(self):
+        """Forget the previous tick's answers, things may have moved or the grid may have changed"""
+        self.cache.clear()
+
+    def visible(self, source_position, target_position):
+        """Line of sight between two world pixel positions"""
+        key = self.tile_map.world_to_tile(source_position) + self.tile_map.world_to_tile(target_position)
+        if key not in self.cache:
+            self.rays_cast += 1
+            self.cache[key] = has_line_of_sight(self.tile_map.solid, key[:2], key[2:])
+        return self.cache[key]
+
+    def visible_batch(self, source_positions, target_position):
+        """
+        Line of sight from many world pixel positions ((N, 2) array) to one target in one call
+        Sources sharing a tile share a ray, and only tiles missing from the cache are cast
+        """
+        source_positions = np.asarray(source_positions, dtype=np.float32).reshape(-1, 2)
+        if not len(source_positions):
+            return np.zeros(0, dtype=bool)
+
+        source_tiles = np.floor(source_positions / SCALED_TILE_SIZE).astype(np.int64)
+
+        # Pack x, y into one integer per tile, unique on plain integers is far cheaper than on rows
+        packed = (source_tiles[:, 1] << 32) + source_tiles[:, 0]
+        unique_packed, inverse = np.unique(packed, return_inverse=True)
+        unique_x = (unique_packed << 32) >> 32  # sign-extend the low half back
+        unique_tiles = np.stack((unique_x, (unique_packed - unique_x) >> 32), axis=1)
+        target_tile = self.tile_map.world_to_tile(target_position)
+
+        unique_visible = np.zeros(len(unique_tiles), dtype=bool)
+        uncached = []
+        for i, (x, y) in enumerate(unique_tiles.tolist()):
+            cached = self.cache.get((x, y) + target_tile)
+            if cached is None:
+                uncached.append(i)
+            else:
+                unique_visible[i] = cached
+
+        if uncached:
+            self.rays_cast += len(uncached)
+            results = cast_rays(self.tile_map.solid, unique_tiles[uncached], target_tile)
+            unique_visible[uncached] = results
+            for (x, y), result in zip(unique_tiles[uncached].tolist(), results.tolist()):
+                self.cache[(x, y) + target_tile] = result
+
+        return unique_visible[inverse.reshape(-1)]
@@ -0,0 +1,272 @@
+"""
+Pathfinding over the level's walkable (non-solid) tiles
+FlowField: one distance map with a direction per tile, shared by every enemy chasing the hero
+PathFinder: cached A* for one-off long paths such as patrol routes
+"""
+import heapq
+from collections import OrderedDict, deque
+import numpy as np
+from settings import *
+
+UNREACHABLE = np.iinfo(np.int32).max
+
+STRAIGHT_STEPS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+DIAGONAL_STEPS = ((1, 1), (-1, 1), (1, -1), (-1, -1))
+
+class FlowField:
+    """
+    Steps-to-target from every walkable tile within radius of the target tile, plus the direction to step in
+    Recomputed only when the target moves to another tile, repaired locally when tiles change
+    """
+    def __init__(self, tile_map, radius=FLOW_FIELD_RADIUS):
+        self.tile_map = tile_map
+        self.radius = radius
+        self.target_tile = None
+        self.recomputes = 0
+
+        # Padded by one unreachable/solid tile on every side so neighbour lookups never leave the arrays
+        height, width = tile_map.height, tile_map.width
+        self._distance = np.full((height + 2, width + 2), UNREACHABLE, dtype=np.int32)
+        self._walkable = np.zeros((height + 2, width + 2), dtype=bool)
+        self._walkable[1:-1, 1:-1] = ~tile_map.solid
+        self.direction = np.zeros((height, width, 2), dtype=np.int8)  # [y, x] -> (dx, dy) towards the target
+
+    @property
+    def distance(self):
+        """Steps from each tile to the target, UNREACHABLE outside the radius or behind walls"""
+        return self._distance[1:-1, 1:-1]
+
+    # ==================== BUILDING ====================
+    def update(self, target_position):
+        """Follow the target (world pixels), returns True if the field had to be rebuilt"""
+        target_tile = self.tile_map.world_to_tile(target_position)
+        if target_tile == self.target_tile:
+            return False
+        self.target_tile = target_tile
+        self.recompute()
+        return True
+
+    def recompute(self):
+        """Breadth-first wavefront from the target tile, one vectorized pass per step of distance"""
+        self.recomputes += 1
+        self._distance.fill(UNREACHABLE)
+        self.direction.fill(0)
+
+        target_x, target_y = self.target_tile
+        if not self.tile_map.in_bounds(target_x, target_y) or self.tile_map.solid[target_y, target_x]:
+            return
+
+        padded_width = self._distance.shape[1]
+        distance = self._distance.ravel()
+        walkable = self._walkable.ravel()
+        neighbour_offsets = np.array([1, -1, padded_width, -padded_width])
+
+        frontier = np.array([(target_y + 1) * padded_width + target_x + 1])
+        distance[frontier] = 0
+        for steps in range(1, self.radius + 1):
+            # The solid border keeps every neighbour index inside the padded array
+            neighbours = np.unique((frontier[:, None] + neighbour_offsets).ravel())
+            frontier = neighbours[walkable[neighbours] & (distance[neighbours] == UNREACHABLE)]
+            if not len(frontier):
+                break
+            distance[frontier] = steps
+
+        self._update_directions(target_x - self.radius, target_y - self.radius,
+                                target_x + self.radius + 1, target_y + self.radius + 1)
+
+    def _update_directions(self, left, top, right, bottom):
+        """Point every reachable tile in the area at its lowest-distance neighbour"""
+        left, top = max(0, left), max(0, top)
+        right, bottom = min(self.tile_map.width, right), min(self.tile_map.height, bottom)
+        if left >= right or top >= bottom:
+            return
+
+        def shifted(grid, dx, dy):
+            return grid[top + 1 + dy:bottom + 1 + dy, left + 1 + dx:right + 1 + dx]
+
+        own = shifted(self._distance, 0, 0)
+        best = own.copy()
+        direction = np.zeros(own.shape + (2,), dtype=np.int8)
+        for dx, dy in STRAIGHT_STEPS + DIAGONAL_STEPS:
+            neighbour = shifted(self._distance, dx, dy)
+            if dx and dy:
+                # Diagonal steps may not cut the corner of a solid tile
+                neighbour = np.where(shifted(self._walkable, dx, 0) & shifted(self._walkable, 0, dy), neighbour, UNREACHABLE)
+            better = neighbour < best
+            best[better] = neighbour[better]
+            direction[better] = (dx, dy)
+
+        direction[own == UNREACHABLE] = 0
+        self.direction[top:bottom, left:right] = direction
+
+    # ==================== TILE CHANGES ====================
+    def tile_changed(self, x, y):
+        """Repair the field around a tile whose solidity changed (TileMap.solid must already be updated)"""
+        walkable = not self.tile_map.solid[y, x]
+        self._walkable[y + 1, x + 1] = walkable
+        if self.target_tile is None:
+            return
+
+        if walkable:
+            changed = self._open_tile(x, y)
+        else:
+            changed = self._close_tile(x, y)
+
+        # Directions change around every tile whose distance changed, and around the tile itself (corner cutting)
+        changed.append((x, y))
+        xs, ys = [tile[0] for tile in changed], [tile[1] for tile in changed]
+        self._update_directions(min(xs) - 1, min(ys) - 1, max(xs) + 2, max(ys) + 2)
+
+    def _neighbours(self, x, y):
+        for dx, dy in STRAIGHT_STEPS:
+            if self._walkable[y + dy + 1, x + dx + 1]:
+                yield x + dx, y + dy
+
+    def _open_tile(self, x, y):
+        """A tile became walkable: distances can only shrink, spread the improvement outwards"""
+        distance = self.distance
+        best = min((distance[ny, nx] for nx, ny in self._neighbours(x, y)), default=UNREACHABLE)
+        if (x, y) == self.target_tile:
+            best = -1
+        if best == UNREACHABLE or best + 1 > self.radius:
+            return []
+
+        distance[y, x] = best + 1
+        return self._relax(deque([(x, y)]))
+
+    def _close_tile(self, x, y):
+        """A tile became solid: every tile whose shortest routes all ran through it has to be re-derived"""
+        distance = self.distance
+        if distance[y, x] == UNREACHABLE:
+            return []
+
+        # Collect tiles left without a neighbour one step closer to the target, in order of distance
+        removed = {(x, y)}
+        queue = deque([(x, y)])
+        while queue:
+            cx, cy = queue.popleft()
+            for nx, ny in self._neighbours(cx, cy):
+                if (nx, ny) in removed or distance[ny, nx] != distance[cy, cx] + 1:
+                    continue
+                still_supported = any(distance[py, px] == distance[ny, nx] - 1 and (px, py) not in removed
+                                      for px, py in self._neighbours(nx, ny))
+                if not still_supported:
+                    removed.add((nx, ny))
+                    queue.append((nx, ny))
+
+        for rx, ry in removed:
+            distance[ry, rx] = UNREACHABLE
+
+        # Re-seed the removed tiles from their surviving neighbours, then spread outwards
+        seeds = []
+        for rx, ry in removed:
+            if (rx, ry) == (x, y):
+                continue
+            best = min((distance[ny, nx] for nx, ny in self._neighbours(rx, ry)), default=UNREACHABLE)
+            if best != UNREACHABLE and best + 1 <= self.radius:
+                distance[ry, rx] = best + 1
+                seeds.append((rx, ry))
+
+        seeds.sort(key=lambda tile: distance[tile[1], tile[0]])
+        self._relax(deque(seeds))
+        return list(removed)
+
+    def _relax(self, queue):
+        """Spread distances from the queued tiles to any neighbour they improve, returns the tiles changed"""
+        distance = self.distance
+        changed = list(queue)
+        while queue:
+            cx, cy = queue.popleft()
+            steps = distance[cy, cx] + 1
+            if steps > self.radius:
+                continue
+            for nx, ny in self._neighbours(cx, cy):
+                if distance[ny, nx] > steps:
+                    distance[ny, nx] = steps
+                    queue.append((nx, ny))
+                    changed.append((nx, ny))
+        return changed
+
+    # ==================== SAMPLING ====================
+    def direction_at(self, position):
+        """(dx, dy) tile step towards the target from a world pixel position, (0, 0) off the field"""
+        x, y = self.tile_map.world_to_tile(position)
+        if not self.tile_map.in_bounds(x, y):
+            return 0, 0
+        dx, dy = self.direction[y, x].tolist()
+        return dx, dy
+
+    def sample(self, tiles):
+        """Directions ((N, 2)) and distances ((N,)) for an (N, 2) array of x, y tiles"""
+        tiles = np.asarray(tiles, dtype=np.int32).reshape(-1, 2)
+        x = np.clip(tiles[:, 0], -1, self.tile_map.width)
+        y = np.clip(tiles[:, 1], -1, self.tile_map.height)
+        distance = self._distance[y + 1, x + 1]
+
+        inside = (x >= 0) & (x < self.tile_map.width) & (y >= 0) & (y < self.tile_map.height)
+        direction = np.zeros((len(tiles), 2), dtype=np.int8)
+        direction[inside] = self.direction[y[inside], x[inside]]
+        return direction, distance
+
+class PathFinder:
+    """A* between two tiles, paths are cached until the grid changes"""
+    def __init__(self, tile_map, cache_size=PATH_CACHE_SIZE):
+        self.tile_map = tile_map
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # (start, goal) -> path, least recently used first
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self):
+        """Drop every cached path, call when tiles change"""
+        self.cache.clear()
+
+    def find_path(self, start_tile, goal_tile):
+        """Tuple of tiles from start to goal (both included), empty if the goal can't be reached"""
+        key = (tuple(start_tile), tuple(goal_tile))
+        path = self.cache.get(key)
+        if path is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return path
+
+        self.misses += 1
+        path = self._a_star(*key)
+        self.cache[key] = path
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return path
+
+    def _walkable(self, x, y):
+        return self.tile_map.in_bounds(x, y) and not self.tile_map.solid[y, x]
+
+    def _a_star(self, start, goal):
+        if not self._walkable(*start) or not self._walkable(*goal):
+            return ()
+
+        goal_x, goal_y = goal
+        came_from = {start: None}
+        cost = {start: 0}
+        open_tiles = [(abs(start[0] - goal_x) + abs(start[1] - goal_y), 0, start)]
+
+        while open_tiles:
+            _, steps, tile = heapq.heappop(open_tiles)
+            if tile == goal:
+                path = []
+                while tile is not None:
+                    path.append(tile)
+                    tile = came_from[tile]
+                return tuple(reversed(path))
+            if steps > cost[tile]:
+                continue  # stale entry, a shorter route was found since
+
+            for dx, dy in STRAIGHT_STEPS:
+                neighbour = (tile[0] + dx, tile[1] + dy)
+                if not self._walkable(*neighbour) or cost.get(neighbour, UNREACHABLE) <= steps + 1:
+                    continue
+                cost[neighbour] = steps + 1
+                came_from[neighbour] = tile
+                estimate = steps + 1 + abs(neighbour[0] - goal_x) + abs(neighbour[1] - goal_y)
+                heapq.heappush(open_tiles, (estimate, steps + 1, neighbour))
+
+        return ()
@@ -1,11 +1,90 @@
-import pygame
+from collections.abc import Sequence
+from dataclasses import dataclass
+import numpy as np
+from settings import *
 from GameItems.weapons import WEAPONS
+from GameActions.overlay import COMBAT_OVERLAY
+
+def pack_cells(cells):
+    """One int64 key per (x, y) cell so cell sets can be sorted and searched as plain integers"""
+    cells = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+    return (cells[:, 1] << 32) + (cells[:, 0] & 0xFFFFFFFF)
+
+class HitTargets(Sequence):
+    """Targets hit by an attack, looked up from the index only when read so big hit counts stay cheap"""
+    def __init__(self, targets, rows):
+        self.targets = targets
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, i):
+        return self.targets[int(self.rows[i])]
+
+@dataclass(frozen=True, slots=True, eq=False)
+class AttackHits:
+    """
+    Result of one attack: the targets hit, the cell each was hit in ((N, 2) array)
+    and the damage dealt, one amount for every hit or an array with one per hit
+    """
+    targets: Sequence
+    cells: np.ndarray
+    damage: int | np.ndarray
+
+    def __len__(self):
+        return len(self.targets)
+
+    def __bool__(self):
+        return bool(self.targets)
+
+class TargetIndex:
+    """
+    Attack targets bucketed by the tile cell their centre is in
+    Built once per tick, each attack then only looks up the cells it covers
+    """
+    def __init__(self, centres, targets, cell_size=SCALED_TILE_SIZE):
+        self.targets = targets  # row -> target, a sequence or anything indexable by row
+        centres = np.asarray(centres, dtype=np.float32).reshape(-1, 2)
+        self.cells = np.floor(centres / cell_size).astype(np.int64)
+
+        keys = pack_cells(self.cells)
+        self.order = np.argsort(keys, kind='stable')
+        self.sorted_keys = keys[self.order]
+
+    @classmethod
+    def from_targets(cls, targets):
+        """Index any objects with a rect"""
+        targets = list(targets)
+        return cls([target.rect.center for target in targets], targets)
+
+    def __len__(self):
+        return len(self.order)
+
+    def rows_in(self, cells):
+        """Rows of every target whose cell is one of cells, costs O(cells * log(targets))"""
+        keys = pack_cells(cells)
+        starts = np.searchsorted(self.sorted_keys, keys, side='left')
+        ends = np.searchsorted(self.sorted_keys, keys, side='right')
+        found = ends > starts
+        if not found.any():
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate([self.order[start:end] for start, end in zip(starts[found].tolist(), ends[found].tolist())])
+
+    def take_damage(self, rows, damage):
+        """Apply damage (one amount, or one per row) to the targets in rows, one call each unless a subclass batches it"""
+        for row, amount in zip(rows.tolist(), np.broadcast_to(damage, rows.shape).tolist()):
+            target = self.targets[row]
+            if hasattr(target, 'take_damage'):
+                target.take_damage(amount)
 
 class AttackHandler:
     """Handles all attack-related logic and mechanics"""
     
-    def __init__(self, player):
+    def __init__(self, player, projectiles=None):
         self.player = player
+        self.hero = None  # the level's Hero, attacks come from its world position once it is set
+        self.projectiles = projectiles  # ProjectileSystem of the current level, without one shots hit instantly
         self.attack_cooldown = 0
         self.current_weapon = WEAPONS['fists']
         self.facing_direction = (0, 1)  # Default facing down
@@ -34,6 +113,10 @@ class AttackHandler:
         """Set the direction player is facing"""
         self.facing_direction = direction
     
+    def origin_rect(self):
+        """Rect attacks come from, in world pixels when a level Hero is set (the Player's screen rect before that)"""
+        return (self.hero or self.player).rect
+
     def perform_attack(self, direction=None):
         """
         Perform attack with current weapon
@@ -45,17 +128,27 @@ class AttackHandler:
         if direction:
             self.facing_direction = direction
         
-        # Convert player pixel position to grid position for weapon calculations
-        grid_x = self.player.rect.centerx // 50  # Assuming 50px grid
-        grid_y = self.player.rect.centery // 50
+        # Convert the attacker's world position to the level's tile grid for weapon calculations
+        origin = self.origin_rect()
+        grid_x = int(origin.centerx // SCALED_TILE_SIZE)
+        grid_y = int(origin.centery // SCALED_TILE_SIZE)
         
-        # Get attack area based on weapon
+        # Get attack area based on weapon, a precomputed template moved to the attacker's cell
         attack_positions = self.current_weapon.get_attack_area(
             grid_x, grid_y, self.facing_direction
         )
         
+        # Projectile weapons hit whatever the shot runs into later, not the whole line right now
+        projectile = -1
+        if self.current_weapon.fires_projectile and self.projectiles is not None:
+            projectile = self.projectiles.spawn(
+                origin.center, self.facing_direction, self.current_weapon.weapon_type,
+                self.current_weapon.damage, self.current_weapon.attack_range * SCALED_TILE_SIZE
+            )
+            attack_positions = attack_positions[:0]
+
         # Convert grid positions back to pixel positions for collision detection
-        pixel_positions = [(x * 50, y * 50) for x, y in attack_positions]
+        pixel_positions = attack_positions * SCALED_TILE_SIZE
         
         # Set cooldown
         self.attack_cooldown = self.current_weapon.cooldown
@@ -64,9 +157,11 @@ class AttackHandler:
         return {
             'damage': self.current_weapon.damage,
             'grid_positions': attack_positions,
+            'cells': attack_positions,  # templates never repeat a cell
             'pixel_positions': pixel_positions,
             'weapon_type': self.current_weapon.weapon_type,
             'weapon_name': self.current_weapon.name,
+            'projectile': projectile,  # pool slot of the shot fired, -1 if none
             'attacker': self.player
         }
     
@@ -79,15 +174,11 @@ class AttackHandler:
         
         # Check for attack key (spacebar)
         if keys[pygame.K_SPACE]:
-            # Determine direction based on movement keys
-            if keys[pygame.K_UP]:
-                direction = (0, -1)
-            elif keys[pygame.K_DOWN]:
-                direction = (0, 1)
-            elif keys[pygame.K_LEFT]:
-                direction = (-1, 0)
-            elif keys[pygame.K_RIGHT]:
-                direction = (1, 0)
+            # Determine direction based on movement keys, two keys together attack diagonally
+            dx = keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]
+            dy = keys[pygame.K_DOWN] - keys[pygame.K_UP]
+            if dx or dy:
+                direction = (dx, dy)
             else:
                 # Use current facing direction if no movement key pressed
                 direction = self.facing_direction
@@ -101,69 +192,43 @@ class AttackHandler:
         return None
     
     def _calculate_mouse_direction(self, mouse_pos):
-        """Calculate attack direction from player to mouse position"""
-        player_center_x = self.player.rect.centerx
-        player_center_y = self.player.rect.centery
+        """Calculate attack direction from the attacker to the mouse, mouse_pos in the same (world) coordinates"""
+        player_center_x, player_center_y = self.origin_rect().center
         
         dx = mouse_pos[0] - player_center_x
         dy = mouse_pos[1] - player_center_y
         
-        # Convert to grid direction (8-directional or 4-directional)
-        if abs(dx) > abs(dy):
-            return (1 if dx > 0 else -1, 0)
-        else:
-            return (0, 1 if dy > 0 else -1)
+        # Weapons have templates for any angle, so aim exactly at the mouse
+        if dx == 0 and dy == 0:
+            return self.facing_direction
+        return (dx, dy)
     
     def process_attack_hits(self, attack_info, targets):
         """
-        Process attack against list of potential targets
-        Returns list of hit targets
+        Process attack against potential targets, either a TargetIndex or any list of objects with a rect
+        Only the cells in the attack area are looked up, returns AttackHits
         """
         if not attack_info:
-            return []
-        
-        hits = []
-        
-        for target in targets:
-            # Check if target is in any attack position
-            target_grid_x = target.rect.centerx // 50
-            target_grid_y = target.rect.centery // 50
-            
-            if (target_grid_x, target_grid_y) in attack_info['grid_positions']:
-                # Apply damage if target has take_damage method
-                if hasattr(target, 'take_damage'):
-                    target.take_damage(attack_info['damage'])
-                
-                hits.append({
-                    'target': target,
-                    'damage': attack_info['damage'],
-                    'position': (target_grid_x, target_grid_y)
-                })
-        
-        return hits
+            return AttackHits([], np.zeros((0, 2), dtype=np.int64), 0)
+
+        if not isinstance(targets, TargetIndex):
+            targets = TargetIndex.from_targets(targets)
+
+        rows = targets.rows_in(attack_info['cells'])
+        damage = attack_info['damage']
+        targets.take_damage(rows, damage)
+        return AttackHits(HitTargets(targets.targets, rows), targets.cells[rows], damage)
     
-    def draw_attack_preview(self, screen, direction=None):
+    def draw_attack_preview(self, screen, direction=None, offset=(0, 0)):
         """
-        Draw preview of attack area (for debugging or UI)
+        Draw preview of attack area (for debugging or UI), offset is the camera offset
+        The area comes from a surface cached per weapon and direction, so holding the preview allocates nothing
         """
         if not direction:
             direction = self.facing_direction
         
-        grid_x = self.player.rect.centerx // 50
-        grid_y = self.player.rect.centery // 50
-        
-        attack_positions = self.current_weapon.get_attack_area(
-            grid_x, grid_y, direction
-        )
+        origin = self.origin_rect()
+        grid_x = int(origin.centerx // SCALED_TILE_SIZE)
+        grid_y = int(origin.centery // SCALED_TILE_SIZE)
         
-        # Draw semi-transparent rectangles for attack area
-        for pos_x, pos_y in attack_positions:
-            pixel_x = pos_x * 50
-            pixel_y = pos_y * 50
-            
-            # Create semi-transparent surface
-            attack_surface = pygame.Surface((50, 50))
-            attack_surface.set_alpha(200)  # Semi-transparent
-            attack_surface.fill((255, 255, 0))  # Yellow
-            
-            screen.blit(attack_surface, (pixel_x, pixel_y))
+        COMBAT_OVERLAY.draw_area(screen, self.current_weapon.get_template(direction), (grid_x, grid_y), offset)
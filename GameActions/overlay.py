@@ -0,0 +1,56 @@
+from settings import *
+from Helpers.assets import ASSETS
+
+PREVIEW_COLOUR = (255, 255, 0)  # Yellow
+PREVIEW_ALPHA = 200             # Semi-transparent
+
+class CombatOverlay:
+    """Draws attack areas from cached surfaces, nothing is allocated while the same attacks are shown"""
+    def __init__(self):
+        self.area_surfaces = {}  # (template, colour, alpha) -> (surface, (min_dx, min_dy))
+
+    def cell_surface(self, colour=PREVIEW_COLOUR, alpha=PREVIEW_ALPHA):
+        """One tinted tile-sized surface per colour and alpha, shared through the asset manager"""
+        return ASSETS.overlay(alpha, (SCALED_TILE_SIZE, SCALED_TILE_SIZE), colour)
+
+    def area_surface(self, template, colour=PREVIEW_COLOUR, alpha=PREVIEW_ALPHA):
+        """The whole attack area composed onto one surface, built once per template (weapon and direction)"""
+        key = (template, tuple(colour), alpha)
+        entry = self.area_surfaces.get(key)
+        if entry:
+            return entry
+
+        # Only as big as the area itself, offset by its top-left cell
+        min_dx, min_dy = template.offsets.min(axis=0).tolist()
+        max_dx, max_dy = template.offsets.max(axis=0).tolist()
+        surface = pygame.Surface(((max_dx - min_dx + 1) * SCALED_TILE_SIZE, (max_dy - min_dy + 1) * SCALED_TILE_SIZE), pygame.SRCALPHA)
+        for dx, dy in template.offsets.tolist():
+            surface.fill((*colour, alpha), ((dx - min_dx) * SCALED_TILE_SIZE, (dy - min_dy) * SCALED_TILE_SIZE,
+                                            SCALED_TILE_SIZE, SCALED_TILE_SIZE))
+        if pygame.display.get_surface():
+            surface = surface.convert_alpha()
+
+        entry = (surface, (min_dx, min_dy))
+        self.area_surfaces[key] = entry
+        return entry
+
+    def draw_area(self, screen, template, cell, offset=(0, 0), colour=PREVIEW_COLOUR, alpha=PREVIEW_ALPHA):
+        """Blit a template's cached area surface with the attacker at cell, offset is the camera offset"""
+        if not len(template):
+            return
+        surface, (min_dx, min_dy) = self.area_surface(template, colour, alpha)
+        screen.blit(surface, ((cell[0] + min_dx) * SCALED_TILE_SIZE - offset[0],
+                              (cell[1] + min_dy) * SCALED_TILE_SIZE - offset[1]))
+
+    def draw_cells(self, screen, cells, offset=(0, 0), colour=PREVIEW_COLOUR, alpha=PREVIEW_ALPHA):
+        """Tint arbitrary cells ((N, 2) array) with one batched blit of the shared cell surface"""
+        cell_surface = self.cell_surface(colour, alpha)
+        screen.fblits([(cell_surface, (x * SCALED_TILE_SIZE - offset[0], y * SCALED_TILE_SIZE - offset[1]))
+                       for x, y in cells.tolist()])
+
+    def clear(self):
+        """Drop the composed areas, e.g. after the display mode changes"""
+        self.area_surfaces.clear()
+
+# Shared overlay renderer
+COMBAT_OVERLAY = CombatOverlay()
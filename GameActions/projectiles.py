@@ -0,0 +1,164 @@
+import math
+import numpy as np
+from settings import *
+from GameActions.combat import AttackHits, HitTargets, pack_cells
+
+# Sweeps sample each projectile's path at least this often (pixels), well under a tile so no wall is skipped
+SWEEP_STEP = SCALED_TILE_SIZE / 4
+
+NO_HITS = AttackHits([], np.zeros((0, 2), dtype=np.int64), np.zeros(0, dtype=np.float32))
+
+class ProjectileSystem:
+    """
+    Arrows and spells in a fixed pool of preallocated arrays, spawning a shot only writes into a free slot
+    Each step sweeps every projectile's path against the level's solid tiles and a TargetIndex at once
+    """
+    def __init__(self, tile_map, capacity=PROJECTILE_POOL_SIZE):
+        self.tile_map = tile_map
+        self.kinds = list(PROJECTILE_ATTRIBUTES)
+
+        self.position = np.zeros((capacity, 2), dtype=np.float32)      # centre in world pixels
+        self.old_position = np.zeros((capacity, 2), dtype=np.float32)  # for interpolated drawing
+        self.velocity = np.zeros((capacity, 2), dtype=np.float32)      # pixels per frame at BASE_FRAME_RATE
+        self.range_left = np.zeros(capacity, dtype=np.float32)         # pixels it may still travel
+        self.damage = np.zeros(capacity, dtype=np.float32)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+        # Stack of free slots, the top is free_slots[free_count - 1]
+        self.free_slots = np.arange(capacity - 1, -1, -1, dtype=np.int32)
+        self.free_count = capacity
+        self.dropped = 0  # shots lost because the pool was full
+
+        self.images = []
+        for attributes in PROJECTILE_ATTRIBUTES.values():
+            image = pygame.Surface((attributes["size"], attributes["size"]))
+            image.fill(attributes["colour"])
+            self.images.append(image)
+
+    @property
+    def capacity(self):
+        return len(self.alive)
+
+    @property
+    def active_count(self):
+        return self.capacity - self.free_count
+
+    # ==================== SPAWNING ====================
+    def spawn(self, pos, direction, kind, damage, max_range):
+        """Fire one projectile from pos (world pixels) along direction, returns its slot or -1 if the pool is full"""
+        length = math.hypot(*direction)
+        if not length:
+            return -1
+        direction = (direction[0] / length, direction[1] / length)
+        slots = self.spawn_many(np.array([pos]), np.array([direction]), kind, damage, max_range)
+        return int(slots[0]) if len(slots) else -1
+
+    def spawn_many(self, positions, directions, kind, damage, max_range):
+        """Fire a volley, directions must be unit vectors, returns the slots used"""
+        count = min(len(positions), self.free_count)
+        self.dropped += len(positions) - count
+        if not count:
+            return np.zeros(0, dtype=np.int32)
+
+        slots = self.free_slots[self.free_count - count:self.free_count][::-1].copy()
+        self.free_count -= count
+
+        attributes = PROJECTILE_ATTRIBUTES[kind]
+        self.position[slots] = self.old_position[slots] = positions[:count]
+        self.velocity[slots] = directions[:count] * attributes["speed"]
+        self.range_left[slots] = max_range
+        self.damage[slots] = damage
+        self.kind[slots] = self.kinds.index(kind)
+        self.alive[slots] = True
+        return slots
+
+    def _release(self, slots):
+        self.alive[slots] = False
+        self.free_slots[self.free_count:self.free_count + len(slots)] = slots
+        self.free_count += len(slots)
+
+    def clear(self):
+        self._release(np.flatnonzero(self.alive).astype(np.int32))
+
+    # ==================== UPDATE ====================
+    def update(self, dt, targets=None):
+        """
+        Move every projectile by one step of dt seconds, stopping at the first wall or target cell on its path
+        targets is a TargetIndex (e.g. EnemySystem.target_index()), returns AttackHits with per-hit damage
+        """
+        live = np.flatnonzero(self.alive)
+        if not len(live):
+            return NO_HITS
+
+        start = self.position[live]
+        self.old_position[live] = start
+
+        # This step's movement, cut short where the projectile runs out of range
+        delta = self.velocity[live] * (dt * BASE_FRAME_RATE)
+        travel = np.hypot(delta[:, 0], delta[:, 1])
+        range_left = self.range_left[live]
+        delta *= np.minimum(1, range_left / np.maximum(travel, 1e-6))[:, None]
+        travel = np.minimum(travel, range_left)
+
+        # Sample every path at the same fractions, enough of them that no sample skips a tile
+        samples = max(1, math.ceil(float(travel.max()) / SWEEP_STEP))
+        fractions = np.arange(1, samples + 1, dtype=np.float32) / samples
+        points = start[:, None, :] + delta[:, None, :] * fractions[None, :, None]
+        cells = np.floor(points / SCALED_TILE_SIZE).astype(np.int64)
+
+        # First sample inside a solid tile or outside the map
+        width, height = self.tile_map.width, self.tile_map.height
+        outside = (cells[..., 0] < 0) | (cells[..., 0] >= width) | (cells[..., 1] < 0) | (cells[..., 1] >= height)
+        blocked = outside | self.tile_map.solid[np.clip(cells[..., 1], 0, height - 1), np.clip(cells[..., 0], 0, width - 1)]
+        first_wall = np.where(blocked.any(axis=1), blocked.argmax(axis=1), samples)
+
+        hits = NO_HITS
+        hit_target = np.zeros(len(live), dtype=bool)
+        if targets is not None and len(targets):
+            # First sample, before any wall, whose cell holds a target
+            keys = pack_cells(cells.reshape(-1, 2)).reshape(cells.shape[:2])
+            found_at = np.searchsorted(targets.sorted_keys, keys)
+            found = targets.sorted_keys[np.minimum(found_at, len(targets) - 1)] == keys
+            found &= np.arange(samples)[None, :] < first_wall[:, None]
+            hit_target = found.any(axis=1)
+
+            if hit_target.any():
+                hit_sample = found[hit_target].argmax(axis=1)
+                rows = targets.order[found_at[hit_target, hit_sample]]
+                damage = self.damage[live[hit_target]]
+                targets.take_damage(rows, damage)
+                hits = AttackHits(HitTargets(targets.targets, rows), cells[hit_target, hit_sample], damage)
+
+        self.position[live] = start + delta
+        self.range_left[live] -= travel
+
+        expired = hit_target | (first_wall < samples) | (self.range_left[live] <= 0)
+        self._release(live[expired].astype(np.int32))
+        return hits
+
+    # ==================== DRAWING ====================
+    def convert(self):
+        """Match the display pixel format (main thread only)"""
+        if pygame.display.get_surface():
+            self.images = [image.convert() for image in self.images]
+
+    def draw(self, surface, offset, alpha=1.0):
+        """Draw every live projectile on screen, blended between the last two steps, returns the (N, 4) screen rects drawn"""
+        live = np.flatnonzero(self.alive)
+        if not len(live):
+            return np.zeros((0, 4), dtype=np.float32)
+
+        old_position = self.old_position[live]
+        centres = old_position + (self.position[live] - old_position) * alpha - np.asarray(offset, dtype=np.float32)
+        width, height = surface.get_size()
+        visible = (centres[:, 0] > -SCALED_TILE_SIZE) & (centres[:, 0] < width + SCALED_TILE_SIZE) \
+                  & (centres[:, 1] > -SCALED_TILE_SIZE) & (centres[:, 1] < height + SCALED_TILE_SIZE)
+
+        images = self.images
+        kinds = self.kind[live][visible]
+        surface.fblits([(images[kind], (x - images[kind].get_width() / 2, y - images[kind].get_height() / 2))
+                        for kind, (x, y) in zip(kinds.tolist(), centres[visible].tolist())])
+
+        sizes = np.array([image.get_size() for image in images], dtype=np.float32)[kinds]
+        return np.concatenate((centres[visible] - sizes / 2, sizes), axis=1)
@@ -3,6 +3,7 @@ import pygame
 from .base import GameObject
 from GlobalColours.colour_config import G_COLOURS
 from Helpers.constants import PLAYER_ATTRIBUTES, HEALTH_BAR_ATTRIBUTES
+from GameSystems.events import EVENTS, InteractionEvent
 
 class Wall(GameObject):
     """Static wall that blocks movement"""
@@ -29,14 +30,14 @@ class Door(GameObject):
         self.is_open = True
         self.solid = False
         self.color = G_COLOURS.door.opened  # Lighter brown when open
-        print("Door opened!")
+        EVENTS.emit(InteractionEvent("Door", "opened"))
     
     def close(self):
         """Close the door"""
         self.is_open = False
         self.solid = True
         self.color = G_COLOURS.door.closed  # Original brown
-        print("Door closed!")
+        EVENTS.emit(InteractionEvent("Door", "closed"))
 
 class Chest(GameObject):
     """Treasure chest that can contain items"""
@@ -50,9 +51,9 @@ class Chest(GameObject):
         """Called when player interacts with this chest"""
         if not self.is_open:
             items = self.open()
-            print(f"Opened chest! Found {len(items)} items")
+            EVENTS.emit(InteractionEvent("Chest", "opened", f"found {len(items)} items"))
         else:
-            print("Chest is already open")
+            EVENTS.emit(InteractionEvent("Chest", "already open"))
     
     def open(self):
         """Open the chest"""
@@ -1,5 +1,48 @@
-import pygame
 import math
+import numpy as np
+from Helpers.constants import PROJECTILE_ATTRIBUTES
+
+# Attack areas may reach this many cells from the attacker, it sizes every template's bitmask window
+TEMPLATE_RADIUS = 8
+TEMPLATE_SIZE = TEMPLATE_RADIUS * 2 + 1
+
+# Grid directions templates are built for up front, anything else is quantized to ANGLE_STEPS angles
+EIGHT_WAY_DIRECTIONS = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))
+ANGLE_STEPS = 64
+CONE_HALF_ANGLE = math.radians(45) + 1e-6  # cardinal cones then cover the same 3 cells as before
+
+class AttackTemplate:
+    """Immutable attack shape relative to the attacker's cell, as offsets, a bool grid and a bitmask"""
+    def __init__(self, offsets):
+        offsets = sorted(set(offsets))
+        if any(max(abs(dx), abs(dy)) > TEMPLATE_RADIUS for dx, dy in offsets):
+            raise ValueError(f"attack area reaches beyond TEMPLATE_RADIUS ({TEMPLATE_RADIUS}) cells")
+
+        self.offsets = np.array(offsets, dtype=np.int32).reshape(-1, 2)
+        self.offsets.flags.writeable = False
+
+        # grid[dy + TEMPLATE_RADIUS, dx + TEMPLATE_RADIUS], the same cells as one integer for overlap tests
+        self.grid = np.zeros((TEMPLATE_SIZE, TEMPLATE_SIZE), dtype=bool)
+        self.grid[self.offsets[:, 1] + TEMPLATE_RADIUS, self.offsets[:, 0] + TEMPLATE_RADIUS] = True
+        self.grid.flags.writeable = False
+        self.mask = int.from_bytes(np.packbits(self.grid.ravel(), bitorder='little').tobytes(), 'little')
+
+    def translate(self, x, y):
+        """Cells covered when attacking from cell x, y, one array add"""
+        return self.offsets + np.array((x, y), dtype=np.int32)
+
+    def covers(self, dx, dy):
+        """True if the cell dx, dy away from the attacker is hit"""
+        if max(abs(dx), abs(dy)) > TEMPLATE_RADIUS:
+            return False
+        return bool(self.mask >> ((dy + TEMPLATE_RADIUS) * TEMPLATE_SIZE + dx + TEMPLATE_RADIUS) & 1)
+
+    def overlaps(self, other):
+        """True if two templates from the same origin share any cell"""
+        return bool(self.mask & other.mask)
+
+    def __len__(self):
+        return len(self.offsets)
 
 class Weapon:
     def __init__(self, name, damage, attack_range, area_type, cooldown, weapon_type):
@@ -9,47 +52,77 @@ class Weapon:
         self.area_type = area_type  # 'single', 'line', 'cone', 'circle'
         self.cooldown = cooldown  # frames between attacks
         self.weapon_type = weapon_type  # 'melee', 'ranged', 'magic'
-        
+
+        # Ranged and magic line weapons fire a projectile that travels the line instead of hitting it at once
+        self.fires_projectile = weapon_type in PROJECTILE_ATTRIBUTES and area_type == 'line'
+
+        # Shapes only depend on weapon and direction, build them once
+        self.templates = {direction: AttackTemplate(self._build_area(direction)) for direction in EIGHT_WAY_DIRECTIONS}
+        self.angle_templates = {}  # quantized angle step -> template, filled on first use
+
     def get_attack_area(self, player_x, player_y, direction):
-        """Returns list of (x, y) coordinates that this weapon attacks"""
+        """Returns an (N, 2) array of the x, y cells this weapon attacks"""
+        return self.get_template(direction).translate(player_x, player_y)
+
+    def get_template(self, direction):
+        """Template for an 8-way grid direction, or for any other direction vector (e.g. towards the mouse)"""
+        template = self.templates.get(tuple(direction))
+        if template is not None:
+            return template
+
+        step = round(math.atan2(direction[1], direction[0]) / (2 * math.pi) * ANGLE_STEPS) % ANGLE_STEPS
+        template = self.angle_templates.get(step)
+        if template is None:
+            angle = step * 2 * math.pi / ANGLE_STEPS
+            template = AttackTemplate(self._build_area((math.cos(angle), math.sin(angle))))
+            self.angle_templates[step] = template
+        return template
+
+    def _build_area(self, direction):
+        """Offsets this weapon attacks in a direction, only run while building templates"""
         if self.area_type == 'single':
-            return [(player_x + direction[0], player_y + direction[1])]
+            return [self._grid_step(direction)]
         elif self.area_type == 'line':
-            return self._get_line_area(player_x, player_y, direction)
+            return self._get_line_area(direction)
         elif self.area_type == 'cone':
-            return self._get_cone_area(player_x, player_y, direction)
+            return self._get_cone_area(direction)
         elif self.area_type == 'circle':
-            return self._get_circle_area(player_x, player_y)
-        
-    def _get_line_area(self, x, y, direction):
+            return self._get_circle_area()
+        return []
+
+    @staticmethod
+    def _grid_step(direction, distance=1):
+        """Cell distance steps along a direction, exact for grid directions and rounded for any other angle"""
+        dx, dy = direction
+        if dx in (-1, 0, 1) and dy in (-1, 0, 1):
+            return dx * distance, dy * distance
+        length = math.hypot(dx, dy)
+        return round(dx / length * distance), round(dy / length * distance)
+
+    def _get_line_area(self, direction):
         """Attack in a line (for spears, staffs)"""
-        positions = []
-        for i in range(1, self.attack_range + 1):
-            positions.append((x + direction[0] * i, y + direction[1] * i))
-        return positions
-    
-    def _get_cone_area(self, x, y, direction):
+        return [self._grid_step(direction, i) for i in range(1, self.attack_range + 1)]
+
+    def _get_cone_area(self, direction):
         """Attack in a cone (for swords, magic)"""
-        positions = []
         # Main direction
-        positions.append((x + direction[0], y + direction[1]))
-        
-        # Side attacks for wider weapons
-        if self.attack_range > 1:
-            # Perpendicular directions for cone effect
-            if direction[0] == 0:  # Moving vertically
-                positions.extend([
-                    (x - 1, y + direction[1]),
-                    (x + 1, y + direction[1])
-                ])
-            else:  # Moving horizontally
-                positions.extend([
-                    (x + direction[0], y - 1),
-                    (x + direction[0], y + 1)
-                ])
+        positions = [self._grid_step(direction)]
+        if self.attack_range <= 1:
+            return positions
+
+        # Wider weapons hit every adjacent cell within CONE_HALF_ANGLE of the direction, for a cardinal
+        # direction that is the main cell plus its two neighbours across
+        angle = math.atan2(direction[1], direction[0])
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                if dx == 0 and dy == 0:
+                    continue
+                offset = abs((math.atan2(dy, dx) - angle + math.pi) % (2 * math.pi) - math.pi)
+                if offset <= CONE_HALF_ANGLE:
+                    positions.append((dx, dy))
         return positions
-    
-    def _get_circle_area(self, x, y):
+
+    def _get_circle_area(self):
         """Attack all around player (for magic spells)"""
         positions = []
         for dx in range(-self.attack_range, self.attack_range + 1):
@@ -57,10 +130,10 @@ class Weapon:
                 if dx == 0 and dy == 0:
                     continue
                 if dx*dx + dy*dy <= self.attack_range*self.attack_range:
-                    positions.append((x + dx, y + dy))
+                    positions.append((dx, dy))
         return positions
 
-        
+
 # Weapon definitions
 WEAPONS = {
     'fists': Weapon('Fists', 5, 1, 'single', 15, 'melee'),
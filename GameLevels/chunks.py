@@ -0,0 +1,58 @@
+from settings import *
+
+class ChunkedTileLayer:
+    """Static tile layer baked once into large chunk surfaces"""
+    def __init__(self, tile_map, layer_name, tile_registry, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.chunk_pixels = chunk_size * SCALED_TILE_SIZE
+
+        # (chunk_x, chunk_y) -> baked surface, empty chunks are left out
+        self.chunks = {}
+        self.bake(tile_map, layer_name, tile_registry)
+
+    def bake(self, tile_map, layer_name, tile_registry):
+        """Blit every tile of the layer into the chunk it falls in, one batched blit per chunk"""
+        for chunk_y in range((tile_map.height + self.chunk_size - 1) // self.chunk_size):
+            for chunk_x in range((tile_map.width + self.chunk_size - 1) // self.chunk_size):
+                # The registry hands out one pre-scaled surface per gid, nothing is scaled per tile here
+                tiles = []
+                for x, y, gid in tile_map.region(chunk_x * self.chunk_size, chunk_y * self.chunk_size,
+                                                 self.chunk_size, self.chunk_size, layer_name):
+                    scaled_tile = tile_registry.get(gid)
+                    if scaled_tile:
+                        tiles.append((scaled_tile, ((x % self.chunk_size) * SCALED_TILE_SIZE,
+                                                    (y % self.chunk_size) * SCALED_TILE_SIZE)))
+                if tiles:
+                    chunk = self._create_chunk_surface(tile_map, chunk_x, chunk_y)
+                    chunk.fblits(tiles)
+                    self.chunks[(chunk_x, chunk_y)] = chunk
+
+    def _create_chunk_surface(self, tile_map, chunk_x, chunk_y):
+        """Create an empty transparent surface, clipped to the layer size on the last row/column"""
+        tiles_wide = min(self.chunk_size, tile_map.width - chunk_x * self.chunk_size)
+        tiles_high = min(self.chunk_size, tile_map.height - chunk_y * self.chunk_size)
+        return pygame.Surface((tiles_wide * SCALED_TILE_SIZE, tiles_high * SCALED_TILE_SIZE), pygame.SRCALPHA)
+
+    def convert(self):
+        """Match the display pixel format so blitting a chunk each frame is a plain copy (main thread only)"""
+        if pygame.display.get_surface():
+            for chunk_key, surface in self.chunks.items():
+                self.chunks[chunk_key] = surface.convert_alpha()
+
+    def draw(self, surface, offset=(0, 0)):
+        """Draw the chunks under the viewport with a single batched blit call"""
+        offset_x, offset_y = offset
+        screen_width, screen_height = surface.get_size()
+
+        # The chunk grid is its own spatial index, only look up the cells the screen covers
+        first_x, first_y = int(offset_x // self.chunk_pixels), int(offset_y // self.chunk_pixels)
+        last_x = int((offset_x + screen_width) // self.chunk_pixels)
+        last_y = int((offset_y + screen_height) // self.chunk_pixels)
+
+        visible_chunks = []
+        for chunk_x in range(first_x, last_x + 1):
+            for chunk_y in range(first_y, last_y + 1):
+                chunk = self.chunks.get((chunk_x, chunk_y))
+                if chunk:
+                    visible_chunks.append((chunk, (chunk_x * self.chunk_pixels - offset_x, chunk_y * self.chunk_pixels - offset_y)))
+        surface.fblits(visible_chunks)
@@ -0,0 +1,41 @@
+from settings import *
+
+def greedy_mesh(grid):
+    """
+    Merge contiguous solid tiles into as few axis-aligned rectangles as possible
+    grid is a 2D solidity grid indexed [y][x] (e.g. TileMap.solid)
+    Returns list of (x, y, width, height) in tiles
+    """
+    # Plain byte rows index much faster than numpy scalars in the loops below
+    grid = [bytes(row) for row in grid]
+    height = len(grid)
+    width = len(grid[0]) if height else 0
+    merged = [bytearray(width) for _ in range(height)]
+    rects = []
+
+    for y in range(height):
+        x = 0
+        while x < width:
+            if not grid[y][x] or merged[y][x]:
+                x += 1
+                continue
+
+            # Grow the run to the right as far as it stays solid
+            run_width = 1
+            while x + run_width < width and grid[y][x + run_width] and not merged[y][x + run_width]:
+                run_width += 1
+
+            # Then grow downwards while the whole run below is solid too
+            run_height = 1
+            while y + run_height < height and all(
+                grid[y + run_height][i] and not merged[y + run_height][i] for i in range(x, x + run_width)
+            ):
+                run_height += 1
+
+            for row in range(y, y + run_height):
+                merged[row][x:x + run_width] = b'\x01' * run_width
+
+            rects.append((x, y, run_width, run_height))
+            x += run_width
+
+    return rects
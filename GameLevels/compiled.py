@@ -0,0 +1,306 @@
+"""
+Compiled level cache
+Each TMX map is compiled once into a binary file holding its gid arrays, objects, tile properties
+and a pre-scaled tileset atlas. Later launches memory-map that file instead of parsing XML, and it is
+rebuilt automatically whenever the TMX or any tileset/image it uses changes.
+
+    python -m GameLevels.compiled   (compiles every level in LEVEL_PATHS ahead of time)
+"""
+import os
+import json
+import struct
+import hashlib
+import xml.etree.ElementTree as ElementTree
+import numpy as np
+import pytmx
+from settings import *
+from pytmx.util_pygame import handle_transformation
+from GameLevels.tiles import pack_atlas, atlas_slot_rect
+
+MAGIC = b'TCLV'
+FORMAT_VERSION = 1
+PREAMBLE = struct.Struct('<4sII')  # magic, format version, header length
+DATA_ALIGNMENT = 16
+
+# ==================== SOURCE TRACKING ====================
+def compiled_path(tmx_path):
+    """Where the compiled copy of a TMX map lives"""
+    name = os.path.splitext(os.path.basename(tmx_path))[0]
+    return os.path.join(COMPILED_LEVELS_PATH, f"{name}.lvl")
+
+def source_files(tmx_map):
+    """The TMX file plus every external tileset and tileset image it depends on"""
+    tmx_path = os.path.normpath(tmx_map.filename)
+    map_dir = os.path.dirname(tmx_path)
+    paths = [tmx_path]
+
+    # pytmx forgets external tileset paths once parsed, read them from the root element
+    for tileset_node in ElementTree.parse(tmx_path).getroot().iter('tileset'):
+        if tileset_node.get('source'):
+            paths.append(os.path.normpath(os.path.join(map_dir, tileset_node.get('source'))))
+
+    for tileset in tmx_map.tilesets:
+        if tileset.source:
+            paths.append(os.path.normpath(os.path.join(map_dir, tileset.source)))
+
+    return list(dict.fromkeys(paths))
+
+def file_stamp(path):
+    """Cheap change check (mtime and size), with the content hash as the fallback"""
+    stat = os.stat(path)
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha1': file_hash(path)}
+
+def file_hash(path):
+    with open(path, 'rb') as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
+def is_fresh(header):
+    """True when every recorded source still matches, by mtime/size first and content hash if those moved"""
+    if header.get('scale') != SCALE:
+        return False
+
+    for path, stamp in header['sources'].items():
+        if not os.path.exists(path):
+            return False
+        stat = os.stat(path)
+        if stat.st_mtime_ns == stamp['mtime_ns'] and stat.st_size == stamp['size']:
+            continue
+        # Touched but possibly identical (checkout, copy), only the content decides
+        if file_hash(path) != stamp['sha1']:
+            return False
+    return True
+
+# ==================== COMPILING ====================
+def json_safe(properties):
+    """Keep only properties that survive a JSON round trip (drops pytmx colliders, animation frames...)"""
+    return {key: value for key, value in (properties or {}).items() if isinstance(value, (str, int, float, bool))}
+
+def unconverted_image_loader(filename, colorkey, **kwargs):
+    """
+    pytmx image loader that leaves tiles in their file format
+    Compiling only copies tiles into the atlas, so it never needs a display and can run on any thread
+    """
+    image = pygame.image.load(filename)
+    if colorkey:
+        image.set_colorkey(pygame.Color(f"#{colorkey}"))
+
+    def load_image(rect=None, flags=None):
+        tile = image.subsurface(rect) if rect else image.copy()
+        if flags:
+            tile = handle_transformation(tile, flags)
+        return tile
+    return load_image
+
+def compile_level(tmx_path, output_path=None):
+    """Parse a TMX map with pytmx and write its compiled form, returns the output path"""
+    output_path = output_path or compiled_path(tmx_path)
+    tmx_map = pytmx.TiledMap(tmx_path, image_loader=unconverted_image_loader)
+
+    header = {
+        'format': FORMAT_VERSION,
+        'scale': SCALE,
+        'sources': {path: file_stamp(path) for path in source_files(tmx_map)},
+        'width': tmx_map.width,
+        'height': tmx_map.height,
+        'tilewidth': tmx_map.tilewidth,
+        'tileheight': tmx_map.tileheight,
+        'layers': [],
+        'tile_properties': {}
+    }
+    blobs = []
+    used_gids = set()
+
+    for layer in tmx_map.layers:
+        if hasattr(layer, 'data'):
+            data = np.array(layer.data, dtype=np.uint32)
+            used_gids.update(np.unique(data).tolist())
+            header['layers'].append({'name': layer.name, 'type': 'tiles', 'blob': len(blobs)})
+            blobs.append(data.tobytes())
+        elif isinstance(layer, pytmx.TiledObjectGroup):
+            objects = []
+            for obj in layer:
+                used_gids.add(obj.gid or 0)
+                objects.append({
+                    'id': obj.id, 'name': obj.name, 'type': obj.type,
+                    'x': obj.x, 'y': obj.y, 'width': obj.width, 'height': obj.height,
+                    'gid': obj.gid or 0, 'properties': json_safe(obj.properties)
+                })
+            header['layers'].append({'name': layer.name, 'type': 'objects', 'objects': objects})
+
+    used_gids.discard(0)
+    for gid in sorted(used_gids):
+        properties = json_safe(tmx_map.get_tile_properties_by_gid(gid))
+        if properties:
+            header['tile_properties'][str(gid)] = properties
+
+    # Pre-scaled atlas with one slot per gid that has an image
+    atlas, slots = build_atlas(tmx_map, sorted(used_gids))
+    header['atlas'] = {
+        'blob': len(blobs), 'width': atlas.get_width(), 'height': atlas.get_height(),
+        'slots': {str(gid): slot for gid, slot in slots.items()}
+    }
+    blobs.append(pygame.image.tobytes(atlas, 'RGBA'))
+
+    write_compiled(output_path, header, blobs)
+    return output_path
+
+def build_atlas(tmx_map, gids):
+    """Scale every used tile once and pack them into a single surface, returns (atlas, {gid: slot})"""
+    images = [(gid, tmx_map.get_tile_image_by_gid(gid)) for gid in gids]
+    atlas, _, slots = pack_atlas([(gid, image) for gid, image in images if image])
+    return atlas, slots
+
+def write_compiled(output_path, header, blobs):
+    """Preamble, JSON header, then each blob aligned so arrays can be mapped in place"""
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    # Blob offsets depend on the header length, which depends on the offsets - lay out until it settles
+    header['blobs'] = [[0, len(blob)] for blob in blobs]
+    while True:
+        header_bytes = json.dumps(header).encode()
+        offsets = []
+        offset = align(PREAMBLE.size + len(header_bytes))
+        for blob in blobs:
+            offsets.append(offset)
+            offset = align(offset + len(blob))
+
+        if offsets == [entry[0] for entry in header['blobs']]:
+            break
+        header['blobs'] = [[offset, len(blob)] for offset, blob in zip(offsets, blobs)]
+
+    # Write to a temporary file first so a crash never leaves a half-written cache behind
+    temp_path = output_path + '.tmp'
+    with open(temp_path, 'wb') as file:
+        file.write(PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+        file.write(header_bytes)
+        for (offset, _), blob in zip(header['blobs'], blobs):
+            file.write(b'\0' * (offset - file.tell()))
+            file.write(blob)
+    os.replace(temp_path, output_path)
+
+def align(offset):
+    return (offset + DATA_ALIGNMENT - 1) // DATA_ALIGNMENT * DATA_ALIGNMENT
+
+# ==================== LOADING ====================
+def read_header(path):
+    """Header of a compiled level, or None if the file is missing or from another format version"""
+    try:
+        with open(path, 'rb') as file:
+            magic, version, header_length = PREAMBLE.unpack(file.read(PREAMBLE.size))
+            if magic != MAGIC or version != FORMAT_VERSION:
+                return None
+            return json.loads(file.read(header_length))
+    except (OSError, struct.error, ValueError):
+        return None
+
+def load_level(tmx_path, convert=True, progress=None):
+    """
+    Compiled level for a TMX map, (re)compiling it first if the cache is missing or stale
+    convert=False skips display format conversion so this can run off the main thread
+    progress, if given, is called with (fraction done, description) as loading moves on
+    """
+    progress = progress or (lambda fraction, description: None)
+    path = compiled_path(tmx_path)
+
+    progress(0.0, "Checking level cache")
+    header = read_header(path)
+    if not header or not is_fresh(header):
+        progress(0.1, "Compiling level")
+        compile_level(tmx_path, path)
+        header = read_header(path)
+
+    progress(0.7, "Mapping level data")
+    level = CompiledLevel(path, header, convert)
+    progress(1.0, "Level data loaded")
+    return level
+
+class CompiledTileLayer:
+    """Tile layer backed by a memory-mapped gid array, mirrors the parts of pytmx's layer we use"""
+    def __init__(self, name, data, level):
+        self.name = name
+        self.data = data  # (height, width) uint32 array of gids
+        self.height, self.width = data.shape
+        self.level = level
+
+    def iter_data(self):
+        """Yields x, y, gid for each tile in the layer"""
+        for y, row in enumerate(self.data.tolist()):
+            for x, gid in enumerate(row):
+                yield x, y, gid
+
+    def tiles(self):
+        """Yields x, y, image for each non-empty tile"""
+        for x, y, gid in self.iter_data():
+            if gid:
+                image = self.level.get_tile_image_by_gid(gid)
+                if image:
+                    yield x, y, image
+
+class CompiledObject:
+    """Map object with the same attribute names as pytmx objects"""
+    def __init__(self, data):
+        self.__dict__.update(data)
+
+class CompiledObjectGroup(list):
+    """Object layer, a plain list of CompiledObjects"""
+    def __init__(self, name, objects):
+        super().__init__(CompiledObject(obj) for obj in objects)
+        self.name = name
+
+class CompiledLevel:
+    """Level loaded from the compiled cache, usable wherever Level expects a pytmx map"""
+    def __init__(self, path, header, convert=True):
+        self.filename = path
+        self.width = header['width']
+        self.height = header['height']
+        self.tilewidth = header['tilewidth']
+        self.tileheight = header['tileheight']
+        self.tile_properties = {int(gid): properties for gid, properties in header['tile_properties'].items()}
+
+        # Gid arrays are views straight into the mapped file, nothing is parsed or copied
+        self.buffer = np.memmap(path, dtype=np.uint8, mode='r')
+        blobs = header['blobs']
+
+        self.layers = []
+        for layer in header['layers']:
+            if layer['type'] == 'tiles':
+                offset, length = blobs[layer['blob']]
+                data = self.buffer[offset:offset + length].view(np.uint32).reshape(self.height, self.width)
+                self.layers.append(CompiledTileLayer(layer['name'], data, self))
+            else:
+                self.layers.append(CompiledObjectGroup(layer['name'], layer['objects']))
+
+        # Tiles are subsurfaces of one pre-scaled atlas
+        atlas = header['atlas']
+        offset, length = blobs[atlas['blob']]
+        self.atlas = pygame.image.frombytes(self.buffer[offset:offset + length].tobytes(),
+                                            (atlas['width'], atlas['height']), 'RGBA')
+        self.atlas_columns = max(1, atlas['width'] // SCALED_TILE_SIZE)
+        self.atlas_slots = {int(gid): slot for gid, slot in atlas['slots'].items()}
+        self.images = {}
+        self.convert_images(convert)
+
+    def convert_images(self, convert=True):
+        """Convert the atlas to the display format (if asked and a display exists) and cut the tile images from it"""
+        if convert and pygame.display.get_surface():
+            self.atlas = self.atlas.convert_alpha()
+
+        self.images = {}
+        for gid, slot in self.atlas_slots.items():
+            self.images[gid] = self.atlas.subsurface(atlas_slot_rect(slot, self.atlas_columns))
+
+    def get_layer_by_name(self, name):
+        for layer in self.layers:
+            if layer.name == name:
+                return layer
+        raise ValueError(f'Layer "{name}" not found')
+
+    def get_tile_image_by_gid(self, gid):
+        return self.images.get(gid)
+
+    def get_tile_properties_by_gid(self, gid):
+        return self.tile_properties.get(gid)
+
+if __name__ == "__main__":
+    for level_path in LEVEL_PATHS:
+        print(f"Compiled {level_path} -> {compile_level(level_path)}")
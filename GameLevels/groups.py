@@ -0,0 +1,126 @@
+from settings import *
+
+def interpolate_position(sprite, alpha):
+    """Rect of a sprite blended from old_rect (alpha 0) to rect (alpha 1)"""
+    old_rect = getattr(sprite, 'old_rect', None)
+    if old_rect is None or alpha >= 1.0 or old_rect == sprite.rect:
+        return sprite.rect
+    return pygame.FRect(
+        old_rect.x + (sprite.rect.x - old_rect.x) * alpha,
+        old_rect.y + (sprite.rect.y - old_rect.y) * alpha,
+        sprite.rect.width,
+        sprite.rect.height
+    )
+
+class SpatialHashGroup(pygame.sprite.Group):
+    """Sprite group that buckets its sprites by grid cell for fast area queries"""
+    def __init__(self, *sprites, cell_size=SPATIAL_HASH_CELL_SIZE):
+        # Buckets have to exist before the base class adds the initial sprites
+        self.cell_size = cell_size
+        self.buckets = {}       # (cell_x, cell_y) -> {sprite: None}, a dict keeps insertion order
+        self.sprite_cells = {}  # sprite -> cell range it is currently bucketed in
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self._insert(sprite, self._cell_range(sprite.rect))
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self._discard(sprite)
+
+    def _cell_range(self, rect):
+        """Inclusive (left, top, right, bottom) cell bounds covered by a rect"""
+        return (
+            int(rect.left // self.cell_size),
+            int(rect.top // self.cell_size),
+            int(rect.right // self.cell_size),
+            int(rect.bottom // self.cell_size)
+        )
+
+    def _insert(self, sprite, cell_range):
+        left, top, right, bottom = cell_range
+        for cell_x in range(left, right + 1):
+            for cell_y in range(top, bottom + 1):
+                self.buckets.setdefault((cell_x, cell_y), {})[sprite] = None
+        self.sprite_cells[sprite] = cell_range
+
+    def _discard(self, sprite):
+        left, top, right, bottom = self.sprite_cells.pop(sprite)
+        for cell_x in range(left, right + 1):
+            for cell_y in range(top, bottom + 1):
+                bucket = self.buckets[(cell_x, cell_y)]
+                del bucket[sprite]
+                if not bucket:
+                    del self.buckets[(cell_x, cell_y)]
+
+    def relocate(self, sprite):
+        """Re-bucket a sprite after its rect has moved"""
+        cell_range = self._cell_range(sprite.rect)
+        if cell_range != self.sprite_cells[sprite]:
+            self._discard(sprite)
+            self._insert(sprite, cell_range)
+
+    def update(self, *args, **kwargs):
+        """Update all sprites, then move any that changed cell into their new buckets"""
+        super().update(*args, **kwargs)
+        for sprite in self.sprites():
+            self.relocate(sprite)
+
+    def query(self, rect):
+        """Return sprites overlapping rect, looking only at the buckets it covers"""
+        left, top, right, bottom = self._cell_range(rect)
+        candidates = {}
+        for cell_x in range(left, right + 1):
+            for cell_y in range(top, bottom + 1):
+                bucket = self.buckets.get((cell_x, cell_y))
+                if bucket:
+                    candidates.update(bucket)
+        return [sprite for sprite in candidates if sprite.rect.colliderect(rect)]
+
+class CameraGroup(SpatialHashGroup):
+    """Spatially hashed group that follows a target and only draws sprites inside the viewport"""
+    def __init__(self, *sprites, cell_size=SPATIAL_HASH_CELL_SIZE):
+        super().__init__(*sprites, cell_size=cell_size)
+
+        self.offset = vector()
+        self.viewport = pygame.FRect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.target = None
+        self.world_size = None  # (width, height) in pixels, the camera never scrolls past it
+
+    def follow(self, target, world_size=None):
+        """Keep target centred on screen, clamped to the world bounds if given"""
+        self.target = target
+        self.world_size = world_size
+
+    def update_camera(self, screen_size=(SCREEN_WIDTH, SCREEN_HEIGHT), alpha=1.0):
+        """Move the viewport so the target's interpolated position is centred"""
+        self.viewport.size = screen_size
+        if self.target:
+            self.viewport.center = interpolate_position(self.target, alpha).center
+
+        if self.world_size:
+            world_width, world_height = self.world_size
+            # Worlds smaller than the screen stay pinned to the top left
+            self.viewport.left = max(0, min(self.viewport.left, world_width - self.viewport.width))
+            self.viewport.top = max(0, min(self.viewport.top, world_height - self.viewport.height))
+
+        self.offset.update(self.viewport.topleft)
+
+    def draw(self, surface, alpha=1.0):
+        """
+        Draw only the sprites overlapping the viewport, shifted by the camera offset
+        alpha blends each sprite between its previous and current simulation position
+        Returns the screen rects drawn to as (x, y, width, height) tuples
+        """
+        offset_x, offset_y = self.offset
+        blits = []
+        drawn = []
+        # Interpolated positions lag the rect by at most one step, so look a tile past the edges
+        for sprite in self.query(self.viewport.inflate(SCALED_TILE_SIZE * 2, SCALED_TILE_SIZE * 2)):
+            rect = interpolate_position(sprite, alpha)
+            position = (rect.left - offset_x, rect.top - offset_y)
+            blits.append((sprite.image, position))
+            drawn.append((*position, *sprite.image.get_size()))
+        surface.fblits(blits)
+        return drawn
@@ -1,35 +1,101 @@
 from settings import *
-from GameLevels.sprites import Sprite
+from GameLevels.sprites import Collider
+from GameLevels.collision import greedy_mesh
+from GameLevels.chunks import ChunkedTileLayer
+from GameLevels.tiles import TileRegistry
+from GameLevels.tilemap import TileMap
+from GameLevels.groups import SpatialHashGroup, CameraGroup
 from Characters.player import Player
 from Characters.hero import Hero
+from Characters.enemy import EnemySystem
+from GameAI.line_of_sight import LineOfSight
+from GameAI.pathfinding import FlowField, PathFinder
+from GameActions.projectiles import ProjectileSystem
+from GameLevels.renderer import DirtyRectRenderer
+from GameSystems.profiler import PROFILER
 
 class Level:
-    def __init__(self, tmx_map):
+    def __init__(self, tmx_map, input_source=None, convert=True):
         self.display_screen = pygame.display.get_surface()
+        self.input_source = input_source
 
         # Groups
-        self.all_sprites = pygame.sprite.Group()
-        self.collision_sprites = pygame.sprite.Group()
+        self.all_sprites = CameraGroup()
+        self.collision_sprites = SpatialHashGroup()
+
+        # Static tile layers, pre-baked into chunk surfaces
+        self.tile_layers = []
+
+        # Keeps the composed background while the camera is still, so only moving things are redrawn
+        self.renderer = DirtyRectRenderer()
 
         self.setup(tmx_map)
 
+        # Built on a loader thread, conversion waits until the level is handed to the main thread
+        if convert:
+            self.convert_surfaces()
+
     def setup(self, tmx_map):
-        for x, y, surf in tmx_map.get_layer_by_name("Ground").tiles():
-            Sprite((x*TILE_SIZE, y*TILE_SIZE), surf, (self.all_sprites, self.collision_sprites))
+        # Static layers live in gid arrays, each distinct tileset tile is scaled once and shared
+        self.tile_map = TileMap(tmx_map)
+        self.tile_registry = TileRegistry(tmx_map)
+        self.tile_layers.append(ChunkedTileLayer(self.tile_map, "Ground", self.tile_registry))
+
+        self.build_colliders()
         
         # Player
         # self.player = Player()
         # self.all_sprites.add(self.player)
 
+        self.hero = None
         for obj in tmx_map.get_layer_by_name("Objects"):
             if obj.name == 'player':
-                Hero((obj.x, obj.y), self.all_sprites, self.collision_sprites)
+                self.hero = Hero((obj.x, obj.y), self.all_sprites, self.collision_sprites, self.input_source)
 
-    def run(self):
-        self.display_screen.fill('gray')
-        self.all_sprites.draw(self.display_screen)
+        # Enemies are simulated together in arrays rather than as individual sprites
+        # Chasing enemies share one flow field towards the hero, one-off routes go through the cached A*
+        self.line_of_sight = LineOfSight(self.tile_map)
+        self.flow_field = FlowField(self.tile_map)
+        self.path_finder = PathFinder(self.tile_map)
+        self.enemies = EnemySystem(self.tile_map, self.line_of_sight, self.flow_field)
+        self.enemies.spawn_from_objects(tmx_map.get_layer_by_name("Objects"))
+
+        # Arrows and spells come from a preallocated pool
+        self.projectiles = ProjectileSystem(self.tile_map)
+        self.projectile_hits = None  # AttackHits of the last step
+
+        # Camera follows the hero and never scrolls past the map edges
+        self.all_sprites.follow(self.hero, self.tile_map.world_size)
+
+    def build_colliders(self):
+        """Solid tiles are merged into a few large colliders instead of one per tile"""
+        for collider in self.collision_sprites.sprites():
+            collider.kill()
+        self.collision_rects = greedy_mesh(self.tile_map.solid)
+        for x, y, width, height in self.collision_rects:
+            Collider((x * SCALED_TILE_SIZE, y * SCALED_TILE_SIZE, width * SCALED_TILE_SIZE, height * SCALED_TILE_SIZE),
+                     self.collision_sprites)
 
-        self.all_sprites.update()
+    def set_tile_solid(self, x, y, solid):
+        """Open or close a tile at runtime, keeping colliders and enemy navigation in step"""
+        if not self.tile_map.set_solid(x, y, solid):
+            return
+        self.build_colliders()
+        self.flow_field.tile_changed(x, y)
+        self.path_finder.invalidate()
+        self.line_of_sight.new_tick()
+
+    def convert_surfaces(self):
+        """Convert baked surfaces to the display format, must run on the main thread"""
+        self.tile_registry.convert()
+        self.enemies.convert()
+        self.projectiles.convert()
+        for tile_layer in self.tile_layers:
+            tile_layer.convert()
+
+    def run(self):
+        self.draw()
+        self.update()
 
         # Draw the player
         # if self.player:
@@ -38,6 +104,47 @@ class Level:
         #     if pygame.key.get_pressed()[pygame.K_SPACE]:
         #         self.player.attack_handler.draw_attack_preview(self.display_screen)
 
+    def update(self, dt=1 / TICK_RATE):
+        """Advance the simulation by one fixed step of dt seconds"""
+        with PROFILER.scope("level.sprites"):
+            self.all_sprites.update(dt)
+        if self.hero:
+            self.line_of_sight.new_tick()
+            with PROFILER.scope("level.flow_field"):
+                self.flow_field.update(self.hero.rect.center)
+            with PROFILER.scope("level.enemies"):
+                self.enemies.update(dt, self.hero.rect.center)
+        with PROFILER.scope("level.projectiles"):
+            self.projectile_hits = self.projectiles.update(dt, self.enemies.target_index())
+
+    def draw(self, alpha=1.0, full=False):
+        """
+        Draw the level as seen by the camera, alpha interpolates between the last two steps
+        Returns the screen rects that changed for pygame.display.update, or None if the whole screen did
+        full redraws everything, for when something else was drawn over the screen since the last call
+        """
+        if full or not DIRTY_RECTS:
+            self.renderer.invalidate()
+
+        self.all_sprites.update_camera(self.display_screen.get_size(), alpha)
+        with PROFILER.scope("level.draw.tiles"):
+            self.renderer.begin(self.display_screen, self.all_sprites.offset, self.draw_background)
+        with PROFILER.scope("level.draw.enemies"):
+            drawn = [self.enemies.draw(self.display_screen, self.all_sprites.offset, alpha),
+                     self.projectiles.draw(self.display_screen, self.all_sprites.offset, alpha)]
+        with PROFILER.scope("level.draw.sprites"):
+            drawn.append(self.all_sprites.draw(self.display_screen, alpha))
+
+        if not DIRTY_RECTS:
+            return None
+        return self.renderer.finish(self.display_screen, drawn)
+
+    def draw_background(self, surface):
+        """Everything that doesn't move: the clear colour and the tile layers under the camera"""
+        surface.fill('gray')
+        for tile_layer in self.tile_layers:
+            tile_layer.draw(surface, self.all_sprites.offset)
+
     def handle_level_events(self, event):
         if event.type == pygame.KEYDOWN:
             # print(f"event key: {event.key}")
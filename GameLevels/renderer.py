@@ -0,0 +1,75 @@
+import numpy as np
+from settings import *
+from GameSystems.screen_cache import DIRTY_BLOCK_SIZE, block_rects, rect_blocks
+
+class DirtyRectRenderer:
+    """
+    Keeps the level's static background (fill and tile layers) composed for the current camera position
+    While the camera holds still, each frame only restores the blocks moving things covered last frame,
+    and only the blocks covered last frame or this frame are pushed to the display
+    Any camera movement or a dirty area past the threshold falls back to a full redraw
+    """
+    def __init__(self, threshold=DIRTY_AREA_THRESHOLD, block=DIRTY_BLOCK_SIZE):
+        self.threshold = threshold
+        self.block = block
+        self.background = None
+        self.background_key = None  # (camera offset, screen size) the background was composed for
+        self.frame_key = None       # camera of the last frame drawn
+        self.previous_blocks = None  # blocks covered by moving things last frame
+        self.full = True             # whether the frame being drawn is a full redraw
+        self.full_frames = 0
+        self.partial_frames = 0
+
+    def invalidate(self):
+        """The screen no longer shows the last frame (another screen was drawn), redraw it all next time"""
+        self.frame_key = None
+
+    def begin(self, screen, offset, draw_background):
+        """
+        Put the background on screen for this frame, draw_background(surface) draws the static layers
+        Returns True for a full frame, False when only last frame's dirty blocks were restored
+        """
+        key = (tuple(offset), screen.get_size())
+        moved = key != self.frame_key
+        self.frame_key = key
+
+        if moved:
+            # Scrolling: draw straight to the screen as usual, composing a background would only be wasted
+            draw_background(screen)
+            self.background_key = None
+            self.full = True
+        elif key != self.background_key:
+            # The camera stopped, keep this view's background for the frames that follow
+            if self.background is None or self.background.get_size() != screen.get_size():
+                self.background = screen.copy()
+            draw_background(self.background)
+            self.background_key = key
+            screen.blit(self.background, (0, 0))
+            self.full = True
+        elif self.previous_blocks.mean() > self.threshold:
+            screen.blit(self.background, (0, 0))
+            self.full = True
+        else:
+            background = self.background
+            screen.blits([(background, rect, rect) for rect in block_rects(self.previous_blocks, self.block)], doreturn=False)
+            self.full = False
+        return self.full
+
+    def finish(self, screen, drawn):
+        """
+        drawn holds the screen rects ((N, 4) x, y, width, height) of everything drawn over the background
+        Returns the rects to pass to pygame.display.update, or None when the whole screen should be flipped
+        """
+        blocks = rect_blocks(np.concatenate([np.asarray(rects, dtype=np.float32).reshape(-1, 4) for rects in drawn]),
+                             screen.get_size(), self.block)
+        previous_blocks, self.previous_blocks = self.previous_blocks, blocks
+        if self.full:
+            self.full_frames += 1
+            return None
+
+        dirty = previous_blocks | blocks
+        if dirty.mean() > self.threshold:
+            self.full_frames += 1
+            return None
+        self.partial_frames += 1
+        return block_rects(dirty, self.block, screen.get_rect())
@@ -0,0 +1,107 @@
+import numpy as np
+from settings import *
+
+class TileMap:
+    """
+    Static tile layers stored as 2D gid arrays (4 bytes per tile) instead of one sprite per tile
+    Arrays are indexed [y, x] in tiles, gid 0 is an empty cell
+    """
+    def __init__(self, tmx_map, solid_layers=COLLISION_LAYERS):
+        self.width = tmx_map.width
+        self.height = tmx_map.height
+
+        # Compiled levels hand over memory-mapped arrays, those are used in place without a copy
+        self.layers = {}
+        for layer in tmx_map.layers:
+            if hasattr(layer, 'data'):
+                self.layers[layer.name] = np.asarray(layer.data, dtype=np.uint32)
+
+        # Properties are per gid, not per tile
+        self.properties = {}
+        for gid in self.used_gids():
+            self.properties[gid] = tmx_map.get_tile_properties_by_gid(gid) or {}
+
+        self.solid = self.build_solidity(solid_layers)
+
+    def used_gids(self):
+        """Every non-empty gid placed on any layer"""
+        gids = set()
+        for data in self.layers.values():
+            gids.update(np.unique(data).tolist())
+        gids.discard(0)
+        return sorted(gids)
+
+    def build_solidity(self, layer_names):
+        """Bool grid [y, x] of solid tiles, tiles are solid unless their tileset marks them otherwise"""
+        solid = np.zeros((self.height, self.width), dtype=bool)
+        for layer_name in layer_names:
+            data = self.layers[layer_name]
+
+            # Lookup table from gid to solidity, applied to the whole layer at once
+            solid_by_gid = np.zeros(int(data.max(initial=0)) + 1, dtype=bool)
+            for gid in np.unique(data).tolist():
+                if gid:
+                    solid_by_gid[gid] = bool(self.properties.get(gid, {}).get(SOLID_PROPERTY, True))
+            solid |= solid_by_gid[data]
+        return solid
+
+    def set_solid(self, x, y, solid):
+        """Change one tile's solidity (e.g. a door opening), returns True if it actually changed"""
+        if not self.in_bounds(x, y) or self.solid[y, x] == solid:
+            return False
+        self.solid[y, x] = solid
+        return True
+
+    # ==================== QUERIES ====================
+    def layer(self, name):
+        if name not in self.layers:
+            raise ValueError(f'Layer "{name}" not found')
+        return self.layers[name]
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def tile_at(self, x, y, layer_name=COLLISION_LAYERS[0]):
+        """Gid at tile x, y, 0 when empty or outside the map"""
+        if not self.in_bounds(x, y):
+            return 0
+        return int(self.layers[layer_name][y, x])
+
+    def properties_at(self, x, y, layer_name=COLLISION_LAYERS[0]):
+        return self.properties.get(self.tile_at(x, y, layer_name), {})
+
+    def is_solid(self, x, y):
+        """Solidity of tile x, y, everything outside the map is open"""
+        return self.in_bounds(x, y) and bool(self.solid[y, x])
+
+    def region(self, x, y, width, height, layer_name=COLLISION_LAYERS[0]):
+        """Yields x, y, gid for each non-empty tile in the area, clipped to the map"""
+        left, top = max(0, x), max(0, y)
+        right, bottom = min(self.width, x + width), min(self.height, y + height)
+        if left >= right or top >= bottom:
+            return
+
+        window = self.layers[layer_name][top:bottom, left:right]
+        rows, columns = np.nonzero(window)
+        for row, column, gid in zip(rows.tolist(), columns.tolist(), window[rows, columns].tolist()):
+            yield left + column, top + row, gid
+
+    def solid_in_rect(self, rect):
+        """True if any solid tile overlaps a rect given in world pixels"""
+        left, top = max(0, int(rect.left // SCALED_TILE_SIZE)), max(0, int(rect.top // SCALED_TILE_SIZE))
+        right = min(self.width, int((rect.right - 1) // SCALED_TILE_SIZE) + 1)
+        bottom = min(self.height, int((rect.bottom - 1) // SCALED_TILE_SIZE) + 1)
+        return left < right and top < bottom and bool(self.solid[top:bottom, left:right].any())
+
+    @staticmethod
+    def world_to_tile(position):
+        """Tile coordinates under a world pixel position"""
+        return int(position[0] // SCALED_TILE_SIZE), int(position[1] // SCALED_TILE_SIZE)
+
+    @property
+    def world_size(self):
+        return self.width * SCALED_TILE_SIZE, self.height * SCALED_TILE_SIZE
+
+    def memory_bytes(self):
+        """Bytes held by the gid and solidity arrays"""
+        return sum(data.nbytes for data in self.layers.values()) + self.solid.nbytes
@@ -0,0 +1,86 @@
+import numpy as np
+from settings import *
+from Helpers.assets import ASSETS
+
+TILE_DIMENSIONS = (SCALED_TILE_SIZE, SCALED_TILE_SIZE)
+
+def scale_tile(image):
+    """Tileset tile at the on-screen tile size, untouched if it is already there (e.g. from a compiled atlas)"""
+    if image.get_size() == TILE_DIMENSIONS:
+        return image
+    return pygame.transform.scale(image, TILE_DIMENSIONS)
+
+def atlas_slot_rect(slot, columns):
+    """Area of an atlas slot, slots are filled row by row"""
+    return pygame.Rect(((slot % columns) * SCALED_TILE_SIZE, (slot // columns) * SCALED_TILE_SIZE), TILE_DIMENSIONS)
+
+def pack_atlas(images):
+    """Scale each (gid, image) once and pack them into one square-ish surface, returns (atlas, columns, {gid: slot})"""
+    columns = max(1, int(len(images) ** 0.5 + 0.999))
+    rows = max(1, (len(images) + columns - 1) // columns)
+    atlas = pygame.Surface((columns * SCALED_TILE_SIZE, rows * SCALED_TILE_SIZE), pygame.SRCALPHA)
+
+    slots = {}
+    for slot, (gid, image) in enumerate(images):
+        atlas.blit(scale_tile(image), atlas_slot_rect(slot, columns))
+        slots[gid] = slot
+    return atlas, columns, slots
+
+class TileRegistry:
+    """
+    One scaled surface per distinct gid, shared by every tile that uses it (flyweight)
+    With atlas=True the tiles are subsurfaces of a single packed surface instead of separate surfaces
+    """
+    def __init__(self, tmx_map, atlas=TILE_ATLAS):
+        self.use_atlas = atlas
+        self.atlas = None
+        self.atlas_columns = 0
+        self.atlas_slots = {}
+        self.images = {}  # gid -> scaled surface
+
+        tileset_images = [(gid, tmx_map.get_tile_image_by_gid(gid)) for gid in sorted(self.used_gids(tmx_map))]
+        tileset_images = [(gid, image) for gid, image in tileset_images if image]
+
+        if self.use_atlas:
+            self.atlas, self.atlas_columns, self.atlas_slots = pack_atlas(tileset_images)
+            self._cut_atlas()
+        else:
+            self.images = {gid: scale_tile(image) for gid, image in tileset_images}
+
+    @staticmethod
+    def used_gids(tmx_map):
+        """Every gid placed on a tile layer or used by an object, only these get a surface"""
+        gids = set()
+        for layer in tmx_map.layers:
+            if hasattr(layer, 'data'):
+                gids.update(np.unique(np.asarray(layer.data)).tolist())
+            else:
+                gids.update(getattr(obj, 'gid', 0) or 0 for obj in layer)
+        gids.discard(0)
+        return gids
+
+    def _cut_atlas(self):
+        self.images = {gid: self.atlas.subsurface(atlas_slot_rect(slot, self.atlas_columns))
+                       for gid, slot in self.atlas_slots.items()}
+
+    def get(self, gid):
+        """Shared scaled surface for a gid, None for empty tiles"""
+        return self.images.get(gid)
+
+    def convert(self):
+        """Match the display pixel format so tile blits are plain copies (main thread only)"""
+        if not pygame.display.get_surface():
+            return
+        # Converted through the asset manager, so tile pixels count towards its memory budget and stats
+        if self.use_atlas:
+            # Subsurfaces share the parent's pixels, convert the atlas once and cut them again
+            self.atlas = ASSETS.scaled(self.atlas, self.atlas.get_size())
+            self._cut_atlas()
+        else:
+            self.images = {gid: ASSETS.scaled(image, TILE_DIMENSIONS) for gid, image in self.images.items()}
+
+    def memory_bytes(self):
+        """Pixel memory held by the registry"""
+        if self.use_atlas:
+            return self.atlas.get_pitch() * self.atlas.get_height()
+        return sum(image.get_pitch() * image.get_height() for image in self.images.values())
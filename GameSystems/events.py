@@ -0,0 +1,195 @@
+import sys
+import time
+import queue
+import logging
+from collections import deque, defaultdict
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, NamedTuple
+from settings import *
+
+# ==================== EVENT RECORDS ====================
+class HitEvent(NamedTuple):
+    """A target took damage from an attack or a projectile"""
+    target: Any
+    damage: float
+    source: str  # weapon or projectile name
+
+    level = logging.INFO
+
+    def describe(self):
+        return f"{self.source} hit {self.target} for {self.damage:g} damage"
+
+    __str__ = describe
+
+class InteractionEvent(NamedTuple):
+    """The player used something in the world (door, chest, inventory, ...)"""
+    subject: str
+    action: str
+    detail: str = ""
+
+    level = logging.INFO
+
+    def describe(self):
+        return f"{self.subject} {self.action}" + (f": {self.detail}" if self.detail else "")
+
+    __str__ = describe
+
+class AssetEvent(NamedTuple):
+    """An image, font or level was loaded, or fell back to a default"""
+    path: str
+    kind: str  # 'image', 'font', ...
+    loaded: bool
+    detail: str = ""
+
+    @property
+    def level(self):
+        return logging.INFO if self.loaded else logging.WARNING
+
+    def describe(self):
+        outcome = "loaded" if self.loaded else "failed to load"
+        return f"{self.kind} '{self.path}' {outcome}" + (f": {self.detail}" if self.detail else "")
+
+    __str__ = describe
+
+class EventBus:
+    """
+    Game events are recorded into a fixed size ring buffer as they happen (safe from any thread),
+    subscribers get them in one batch per event type when dispatch() runs once a tick
+    """
+    def __init__(self, capacity=EVENT_BUFFER_SIZE):
+        self.buffer = deque(maxlen=capacity)  # appends are atomic, the oldest events fall out when full
+        self.subscribers = defaultdict(list)  # event type (None for every event) -> callbacks
+        self.emitted = 0
+        self.dispatched = 0
+        self.tick = 0
+
+    @property
+    def dropped(self):
+        """Events that fell out of the buffer before being dispatched"""
+        return self.emitted - self.dispatched - len(self.buffer)
+
+    def emit(self, event):
+        """Record an event, never blocks or calls subscribers"""
+        self.buffer.append(event)
+        self.emitted += 1
+
+    def subscribe(self, event_type, callback):
+        """callback(events) receives a list of every event_type event since the last dispatch, None for all events"""
+        self.subscribers[event_type].append(callback)
+
+    def unsubscribe(self, event_type, callback):
+        self.subscribers[event_type].remove(callback)
+
+    def dispatch(self):
+        """Hand everything recorded since the last call to the subscribers, oldest first"""
+        self.tick += 1
+        count = len(self.buffer)
+        if not count:
+            return 0
+
+        # Only take what is there now, events emitted meanwhile by another thread wait for the next tick
+        events = [self.buffer.popleft() for _ in range(count)]
+        self.dispatched += count
+
+        by_type = defaultdict(list)
+        for event in events:
+            by_type[type(event)].append(event)
+        for event_type, batch in by_type.items():
+            for callback in self.subscribers.get(event_type, ()):
+                callback(batch)
+        for callback in self.subscribers.get(None, ()):
+            callback(events)
+        return count
+
+    def clear(self):
+        self.dispatched += len(self.buffer)
+        self.buffer.clear()
+
+# ==================== LOGGING ====================
+class RateLimitFilter(logging.Filter):
+    """Lets at most rate records through per second, the next one through says how many were suppressed"""
+    def __init__(self, rate=LOG_RATE_LIMIT):
+        super().__init__()
+        self.rate = rate
+        self.window_start = 0.0
+        self.count = 0
+        self.suppressed = 0
+
+    def saturated(self):
+        """True (and the record counted as suppressed) if this second's budget is used up, cheap enough to ask per event"""
+        now = time.monotonic()
+        if now - self.window_start >= 1:
+            self.window_start = now
+            self.count = 0
+        if self.count >= self.rate:
+            self.suppressed += 1
+            return True
+        return False
+
+    def filter(self, record):
+        if self.saturated():
+            return False
+        self.count += 1
+
+        if self.suppressed:
+            record.msg = f"{record.getMessage()} ({self.suppressed} messages suppressed)"
+            record.args = None
+            self.suppressed = 0
+        return True
+
+class EventLog:
+    """
+    Writes game events and log records to stdout from a background thread
+    The game thread only puts records on a queue (after rate limiting), it never waits on terminal I/O
+    """
+    def __init__(self, bus, logger_name=GAME_NAME, rate=LOG_RATE_LIMIT, stream=None):
+        self.bus = bus
+        self.logger = logging.getLogger(logger_name)
+        self.rate = rate
+        self.stream = stream
+        self.listener = None
+        self.queue_handler = None
+        self.rate_limit = None
+
+    def start(self, level=logging.INFO):
+        """Route the game logger through the writer thread and log every dispatched event"""
+        if self.listener:
+            return
+        records = queue.SimpleQueue()
+        self.queue_handler = QueueHandler(records)
+        self.rate_limit = RateLimitFilter(self.rate)
+        self.queue_handler.addFilter(self.rate_limit)
+
+        stream_handler = logging.StreamHandler(self.stream or sys.stdout)
+        stream_handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+        self.listener = QueueListener(records, stream_handler)
+        self.listener.start()
+
+        self.logger.addHandler(self.queue_handler)
+        self.logger.setLevel(level)
+        self.logger.propagate = False
+        self.bus.subscribe(None, self.log_events)
+
+    def log_events(self, events):
+        """Subscriber: one log record per event, no record is even created once the rate limit is reached"""
+        logger, rate_limit = self.logger, self.rate_limit
+        for event in events:
+            if logger.isEnabledFor(event.level) and not rate_limit.saturated():
+                logger.log(event.level, "%s", event)
+
+    def stop(self):
+        """Flush what is queued and stop the writer thread"""
+        if not self.listener:
+            return
+        self.bus.unsubscribe(None, self.log_events)
+        self.logger.removeHandler(self.queue_handler)
+        self.listener.stop()
+        self.listener = None
+
+# Shared event bus and its log writer
+EVENTS = EventBus()
+EVENT_LOG = EventLog(EVENTS)
+
+def get_logger(name=None):
+    """Logger under the game's logger, so records go through EVENT_LOG's writer thread"""
+    return logging.getLogger(GAME_NAME if not name else f"{GAME_NAME}.{name}")
@@ -0,0 +1,77 @@
+"""
+Headless fixed-step simulation runner
+Steps a Level for N ticks as fast as possible with scripted input, no window, vsync or sleeping
+
+    python -m GameSystems.headless --ticks 10000 [--render] [--level PATH]
+"""
+import os
+import argparse
+from time import perf_counter
+from settings import *
+from GameLevels.compiled import load_level
+from GameLevels.level import Level
+from GameSystems.input import ScriptedInput, DEFAULT_SCRIPT
+from GameSystems.events import EVENTS
+
+def use_dummy_video_driver():
+    """Point SDL at its dummy drivers, must run before the display is initialised"""
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+class HeadlessRunner:
+    """Builds a Level on an off-screen display and steps it at full speed"""
+    def __init__(self, level_path=None, input_source=None, render=False):
+        use_dummy_video_driver()
+        pygame.init()
+        pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+        self.input_source = input_source or ScriptedInput(DEFAULT_SCRIPT)
+        self.render = render
+        self.level = Level(load_level(level_path or LEVEL_PATHS[0]), self.input_source)
+
+    def run(self, ticks):
+        """Step the level ticks times, returns timings for update and (optional) draw"""
+        update_time = 0.0
+        draw_time = 0.0
+
+        for _ in range(ticks):
+            start = perf_counter()
+            self.level.update(1 / TICK_RATE)
+            self.input_source.advance()
+            EVENTS.dispatch()
+            update_time += perf_counter() - start
+
+            if self.render:
+                start = perf_counter()
+                self.level.draw()
+                draw_time += perf_counter() - start
+
+        total_time = update_time + draw_time
+        return {
+            'ticks': ticks,
+            'seconds': total_time,
+            'update_seconds': update_time,
+            'draw_seconds': draw_time,
+            'ticks_per_second': ticks / total_time if total_time else float('inf')
+        }
+
+def format_report(result):
+    """One line summary of a run"""
+    report = f"{result['ticks']} ticks in {result['seconds']:.3f}s ({result['ticks_per_second']:.0f} ticks/s)"
+    report += f" | update {result['update_seconds'] / result['ticks'] * 1000:.3f} ms/tick"
+    if result['draw_seconds']:
+        report += f" | draw {result['draw_seconds'] / result['ticks'] * 1000:.3f} ms/tick"
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the level simulation headless and report ticks per second")
+    parser.add_argument('--ticks', type=int, default=10000, help="number of simulation ticks to run")
+    parser.add_argument('--level', default=None, help="TMX map to load (defaults to the first level)")
+    parser.add_argument('--render', action='store_true', help="also draw every tick to the off-screen display")
+    args = parser.parse_args()
+
+    runner = HeadlessRunner(args.level, render=args.render)
+    print(format_report(runner.run(args.ticks)))
+
+if __name__ == "__main__":
+    main()
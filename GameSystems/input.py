@@ -0,0 +1,52 @@
+from settings import *
+
+class KeyboardInput:
+    """Live keyboard state, read straight from pygame"""
+    def get_pressed(self):
+        return pygame.key.get_pressed()
+
+    def advance(self):
+        """Live input has no script to step through"""
+        pass
+
+class HeldKeys:
+    """Set of held keys that can be indexed like pygame.key.get_pressed()"""
+    def __init__(self, keys=()):
+        self.keys = frozenset(keys)
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+class ScriptedInput:
+    """
+    Replays a fixed script of held keys, one step per simulation tick
+    Script is a list of (ticks, keys) segments, e.g. [(60, [pygame.K_RIGHT]), (1, [pygame.K_SPACE])]
+    """
+    def __init__(self, script, loop=True):
+        # Expand the segments once so advancing is just an index bump
+        self.frames = [HeldKeys(keys) for ticks, keys in script for _ in range(ticks)]
+        self.loop = loop
+        self.tick = 0
+
+    def get_pressed(self):
+        if self.tick < len(self.frames):
+            return self.frames[self.tick]
+        return HeldKeys()  # Script finished, nothing is held
+
+    def advance(self):
+        """Move on to the next tick of the script"""
+        self.tick += 1
+        if self.loop and self.tick >= len(self.frames):
+            self.tick = 0
+
+# Walks right, jumps, walks back left and idles - exercises movement, gravity and collisions
+DEFAULT_SCRIPT = [
+    (90, [pygame.K_RIGHT]),
+    (1, [pygame.K_RIGHT, pygame.K_SPACE]),
+    (60, [pygame.K_RIGHT]),
+    (30, []),
+    (90, [pygame.K_LEFT]),
+    (1, [pygame.K_LEFT, pygame.K_SPACE]),
+    (60, [pygame.K_LEFT]),
+    (30, []),
+]
@@ -0,0 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor
+from settings import *
+from GameLevels.compiled import load_level
+from GameLevels.level import Level
+
+class LevelLoadJob:
+    """A level being loaded on the worker thread, with progress the loading screen can show"""
+    def __init__(self, index):
+        self.index = index
+        self.progress = 0.0
+        self.description = "Waiting to load"
+        self.future = None
+        self.level = None  # set once the main thread has finished the level
+
+    def report(self, progress, description):
+        """Progress callback, called from the worker thread (single attribute writes are atomic)"""
+        self.progress = progress
+        self.description = description
+
+    def ready(self):
+        return self.level is not None or self.future.done()
+
+class LevelLoader:
+    """
+    Loads levels in the background: reading, compiling and building happen on a worker thread,
+    only the display format conversion is left for the main thread when the level is taken
+    """
+    def __init__(self, level_paths=LEVEL_PATHS, input_source=None):
+        self.level_paths = level_paths
+        self.input_source = input_source
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="level-loader")
+        self.jobs = {}  # level index -> LevelLoadJob
+
+    def request(self, index):
+        """Start loading a level if it isn't already, returns its job"""
+        if index not in self.jobs:
+            job = LevelLoadJob(index)
+            job.future = self.executor.submit(self._load, job)
+            self.jobs[index] = job
+        return self.jobs[index]
+
+    def prefetch(self, index):
+        """Load a level ahead of time if it exists, e.g. the next one while this one is played"""
+        if 0 <= index < len(self.level_paths):
+            self.request(index)
+
+    def discard(self, index):
+        """Forget a level's job (e.g. one that failed), the next request loads it again"""
+        self.jobs.pop(index, None)
+
+    def _load(self, job):
+        """Worker thread: everything that doesn't touch the display"""
+        level_data = load_level(self.level_paths[job.index], convert=False,
+                                progress=lambda fraction, description: job.report(fraction * 0.6, description))
+        job.report(0.6, "Building level")
+        level = Level(level_data, self.input_source, convert=False)
+        job.report(0.95, "Preparing graphics")
+        return level
+
+    def ready(self, index):
+        return index in self.jobs and self.jobs[index].ready()
+
+    def take(self, index):
+        """Main thread: finish a loaded level (display conversion) and return it, raises if loading failed"""
+        job = self.jobs[index]
+        if job.level is None:
+            job.level = job.future.result()
+            job.level.convert_surfaces()
+            job.report(1.0, "Ready")
+        return job.level
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,205 @@
+import json
+import threading
+from contextlib import nullcontext
+from time import perf_counter_ns
+import numpy as np
+from settings import *
+from GameSystems.events import get_logger
+
+LOG = get_logger("profiler")
+
+# Returned by scope() while the profiler is off, entering it does nothing
+NULL_SCOPE = nullcontext()
+
+FRAME_SCOPE = "frame"
+PERCENTILES = (50, 95, 99)
+
+OVERLAY_GRAPH_HEIGHT = 60
+OVERLAY_REFRESH_FRAMES = 15  # the text panel is re-rendered this often, not every frame
+OVERLAY_SCOPES = 8           # slowest scopes (by p95) listed under the graph
+
+class ProfileScope:
+    """One timed block, created only while the profiler is on"""
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(self.name, self.start, perf_counter_ns())
+        return False
+
+class FrameProfiler:
+    """
+    Times frame phases and named scopes, keeping per-frame totals for the last PROFILE_HISTORY frames
+    Disabled, scope() hands back a shared no-op context so instrumented code costs one call and a flag check
+    """
+    def __init__(self, history=PROFILE_HISTORY, enabled=PROFILER_ENABLED):
+        self.history = history
+        self.enabled = enabled
+        self.show_overlay = False
+
+        self.frame_start = 0
+        self.frame_open = False  # begin_frame ran while enabled, so this frame can be timed as a whole
+        self.frame_totals = {}  # scope -> ns spent in it this frame
+        self.samples = {}       # scope -> ring buffer of per-frame ms
+        self.frames = 0
+
+        self.origin = perf_counter_ns()
+        self.tracing = False
+        self.trace_events = []
+
+        self.font = None
+        self.panel = None
+        self.panel_age = 0
+
+    # ==================== TIMING ====================
+    def scope(self, name):
+        """Context manager timing a block, a scope entered several times a frame adds up"""
+        if not self.enabled:
+            return NULL_SCOPE
+        return ProfileScope(self, name)
+
+    def record(self, name, start, end):
+        """Add a finished scope (perf_counter_ns timestamps) to this frame and the trace"""
+        self.frame_totals[name] = self.frame_totals.get(name, 0) + end - start
+        if self.tracing:
+            self.trace_events.append({'name': name, 'ph': 'X', 'pid': 0, 'tid': threading.get_ident(),
+                                      'ts': (start - self.origin) / 1000, 'dur': (end - start) / 1000})
+            if len(self.trace_events) >= PROFILE_TRACE_LIMIT:
+                self.stop_trace()
+
+    def begin_frame(self):
+        self.frame_open = self.enabled
+        if self.enabled:
+            self.frame_start = perf_counter_ns()
+
+    def end_frame(self):
+        """Close the frame, every known scope gets this frame's total (0 if it didn't run)"""
+        if not self.enabled or not self.frame_open:
+            # Switched on part way through (e.g. by F3), a partial frame would skew the stats
+            self.frame_totals.clear()
+            return
+        self.record(FRAME_SCOPE, self.frame_start, perf_counter_ns())
+
+        slot = self.frames % self.history
+        for name in self.frame_totals:
+            if name not in self.samples:
+                self.samples[name] = np.zeros(self.history, dtype=np.float32)
+        for name, samples in self.samples.items():
+            samples[slot] = self.frame_totals.get(name, 0) / 1e6
+        self.frame_totals.clear()
+        self.frames += 1
+
+    def set_enabled(self, enabled):
+        if enabled and not self.enabled:
+            self.frame_start = perf_counter_ns()
+        self.enabled = enabled
+        self.frame_totals.clear()
+
+    def reset(self):
+        """Forget the collected timings"""
+        self.samples.clear()
+        self.frame_totals.clear()
+        self.frames = 0
+
+    # ==================== STATS ====================
+    def recent(self, name):
+        """Per-frame ms of a scope over the kept history, oldest first"""
+        samples = self.samples.get(name)
+        if samples is None:
+            return np.zeros(0, dtype=np.float32)
+        if self.frames < self.history:
+            return samples[:self.frames]
+        return np.roll(samples, -(self.frames % self.history))
+
+    def stats(self, name):
+        """p50/p95/p99 and max of a scope's per-frame ms"""
+        recent = self.recent(name)
+        if not len(recent):
+            return {f'p{percentile}': 0.0 for percentile in PERCENTILES} | {'max': 0.0}
+        values = np.percentile(recent, PERCENTILES).tolist()
+        return {f'p{percentile}': value for percentile, value in zip(PERCENTILES, values)} | {'max': float(recent.max())}
+
+    def report(self):
+        """One line per scope, slowest p95 first"""
+        rows = sorted(((name, self.stats(name)) for name in self.samples), key=lambda row: -row[1]['p95'])
+        return [f"{name:<24} p50 {stats['p50']:6.2f}  p95 {stats['p95']:6.2f}  p99 {stats['p99']:6.2f} ms"
+                for name, stats in rows]
+
+    # ==================== TRACE ====================
+    def start_trace(self):
+        """Record every scope as a Chrome trace event until stop_trace()"""
+        self.set_enabled(True)
+        self.trace_events = [{'name': 'thread_name', 'ph': 'M', 'pid': 0, 'tid': threading.get_ident(),
+                              'args': {'name': threading.current_thread().name}}]
+        self.tracing = True
+
+    def stop_trace(self, path=PROFILE_TRACE_PATH):
+        """Stop recording and write the trace, returns the path"""
+        self.tracing = False
+        self.set_enabled(self.show_overlay or PROFILER_ENABLED)
+        self.export_trace(path)
+        LOG.info("wrote %d trace events to %s", len(self.trace_events), path)
+        return path
+
+    def export_trace(self, path=PROFILE_TRACE_PATH):
+        """Chrome trace-event JSON, open it in chrome://tracing or ui.perfetto.dev"""
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': self.trace_events, 'displayTimeUnit': 'ms'}, file)
+
+    # ==================== OVERLAY ====================
+    def toggle_overlay(self):
+        """Show or hide the overlay, the profiler runs while it is shown (or a trace is recorded)"""
+        self.show_overlay = not self.show_overlay
+        self.set_enabled(self.show_overlay or self.tracing)
+
+    def draw_overlay(self, screen, font=None):
+        """Frame time graph against the frame budget, with the slowest scopes listed below it"""
+        if not self.show_overlay:
+            return
+        frame_times = self.recent(FRAME_SCOPE)
+        budget = 1000 / (FPS or TICK_RATE)
+
+        x, y = 8, 8
+        graph = pygame.Rect(x, y, self.history, OVERLAY_GRAPH_HEIGHT)
+        screen.fill((0, 0, 0), graph)
+
+        # One bar per frame, the budget line sits half way up
+        scale = OVERLAY_GRAPH_HEIGHT / (budget * 2)
+        heights = np.minimum(frame_times * scale, OVERLAY_GRAPH_HEIGHT).astype(np.int32).tolist()
+        for column, (height, frame_time) in enumerate(zip(heights, frame_times.tolist())):
+            colour = (0, 200, 0) if frame_time <= budget else (220, 40, 40)
+            screen.fill(colour, (graph.x + column, graph.bottom - height, 1, height))
+        budget_y = graph.bottom - int(budget * scale)
+        pygame.draw.line(screen, (255, 255, 0), (graph.x, budget_y), (graph.right - 1, budget_y))
+
+        # Text changes every frame, so render it into one panel every few frames instead of per line per frame
+        self.panel_age -= 1
+        if self.panel is None or self.panel_age <= 0:
+            if font is None:
+                self.font = self.font or pygame.font.SysFont("monospace", 14)
+                font = self.font
+            self.panel = self._render_panel(font)
+            self.panel_age = OVERLAY_REFRESH_FRAMES
+        screen.blit(self.panel, (x, graph.bottom + 4))
+
+    def _render_panel(self, font):
+        lines = [f"{'scope':<24} ms/frame"] + self.report()[:OVERLAY_SCOPES]
+        if self.tracing:
+            lines.append(f"recording trace ({len(self.trace_events)} events)")
+        line_height = font.get_linesize()
+        width = max(font.size(line)[0] for line in lines)
+        panel = pygame.Surface((width + 8, line_height * len(lines) + 8), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        for i, line in enumerate(lines):
+            panel.blit(font.render(line, True, (255, 255, 255)), (4, 4 + i * line_height))
+        return panel
+
+# Shared profiler, instrumented code calls PROFILER.scope(name)
+PROFILER = FrameProfiler()
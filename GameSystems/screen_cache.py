@@ -0,0 +1,93 @@
+import numpy as np
+from settings import *
+
+DIRTY_BLOCK_SIZE = 32  # changed screen regions are tracked in blocks of this many pixels
+FULL_UPDATE_RATIO = 0.5  # past this fraction of the screen changed, one full flip is cheaper than many rects
+
+def block_rects(blocks, block=DIRTY_BLOCK_SIZE, bounds=None):
+    """
+    Rects covering the True cells of a [row, column] block grid: runs of blocks along each row,
+    with identical runs on consecutive rows merged into one taller rect
+    """
+    rects = []
+    open_runs = {}  # (start, end) column run -> its rect, while the run continues on the next row
+    for row in range(blocks.shape[0]):
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], blocks[row].astype(np.int8), [0]))))
+        runs = {}
+        for start, end in zip(edges[::2].tolist(), edges[1::2].tolist()):
+            rect = open_runs.get((start, end))
+            if rect is None:
+                rect = pygame.Rect(start * block, row * block, (end - start) * block, block)
+                rects.append(rect)
+            else:
+                rect.height += block
+            runs[(start, end)] = rect
+        open_runs = runs
+
+    if bounds is not None:
+        rects = [rect.clip(bounds) for rect in rects]
+    return rects
+
+def rect_blocks(rects, size, block=DIRTY_BLOCK_SIZE):
+    """[row, column] grid of the blocks touched by any of rects ((N, 4) x, y, width, height in pixels)"""
+    columns, rows = -(-size[0] // block), -(-size[1] // block)
+    rects = np.asarray(rects, dtype=np.float32).reshape(-1, 4)
+    if not len(rects):
+        return np.zeros((rows, columns), dtype=bool)
+
+    left = np.clip(np.floor(rects[:, 0] / block), 0, columns).astype(np.int64)
+    top = np.clip(np.floor(rects[:, 1] / block), 0, rows).astype(np.int64)
+    right = np.clip(np.ceil((rects[:, 0] + rects[:, 2]) / block), 0, columns).astype(np.int64)
+    bottom = np.clip(np.ceil((rects[:, 1] + rects[:, 3]) / block), 0, rows).astype(np.int64)
+
+    # Mark every rect's corners in a difference grid, two cumulative sums fill in all of them at once
+    corners = np.zeros((rows + 1, columns + 1), dtype=np.int32)
+    np.add.at(corners, (top, left), 1)
+    np.add.at(corners, (top, right), -1)
+    np.add.at(corners, (bottom, left), -1)
+    np.add.at(corners, (bottom, right), 1)
+    return corners.cumsum(axis=0).cumsum(axis=1)[:rows, :columns] > 0
+
+def changed_rects(old, new, block=DIRTY_BLOCK_SIZE):
+    """Rects covering the blocks where two same-sized surfaces differ"""
+    old_pixels = pygame.surfarray.pixels2d(old)
+    new_pixels = pygame.surfarray.pixels2d(new)
+    changed = (old_pixels != new_pixels).T  # [y, x]
+    del old_pixels, new_pixels  # unlock the surfaces
+
+    height, width = changed.shape
+    rows, columns = -(-height // block), -(-width // block)
+    changed = np.pad(changed, ((0, rows * block - height), (0, columns * block - width)))
+    blocks = changed.reshape(rows, block, columns, block).any(axis=(1, 3))
+    return block_rects(blocks, block, new.get_rect())
+
+class StaticScreen:
+    """
+    Keeps the last composed frame of a screen that only changes on input (menus, pause, game over)
+    present() pushes nothing when the frame is unchanged, only the changed regions when it is
+    """
+    def __init__(self):
+        self.key = None    # what the cached frame shows, anything that changes the picture goes in it
+        self.frame = None  # copy of the last frame pushed to the display
+
+    def is_current(self, key):
+        return self.key is not None and self.key == key
+
+    def invalidate(self):
+        """Next present() pushes the whole screen, e.g. after a window expose or resize"""
+        self.key = None
+
+    def present(self, screen, key):
+        """Push a freshly composed screen to the display, diffed against the cached frame"""
+        if self.key is None or self.frame is None or self.frame.get_size() != screen.get_size():
+            pygame.display.flip()
+            self.frame = screen.copy()
+        else:
+            rects = changed_rects(self.frame, screen)
+            area = sum(rect.width * rect.height for rect in rects)
+            if area > screen.get_width() * screen.get_height() * FULL_UPDATE_RATIO:
+                pygame.display.flip()
+            elif rects:
+                pygame.display.update(rects)
+            self.frame.blit(screen, (0, 0))
+        self.key = key
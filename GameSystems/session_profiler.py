@@ -0,0 +1,183 @@
+"""
+Whole-session profiling for main.py, with results kept separately per game state
+
+cProfile mode writes <state>.pstats (and collapsed stacks rebuilt from its call graph),
+sample mode writes <state>.collapsed from a background thread sampling the main thread's stack
+"""
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+from collections import Counter
+from GameSystems.events import get_logger
+
+LOG = get_logger("profile")
+
+SAMPLE_INTERVAL = 0.002  # seconds between stack samples
+MAX_STACK_DEPTH = 128
+
+def state_name(state):
+    """File name part for a game state (GameState enum or anything else)"""
+    return str(getattr(state, 'value', state))
+
+def short_path(filename):
+    """Path relative to the game for its own files, just the file name for the standard library and packages"""
+    path = os.path.relpath(filename)
+    return os.path.basename(filename) if path.startswith('..') else path
+
+def frame_label(code):
+    """Function label used in collapsed stacks, e.g. GameLevels/level.py:update"""
+    return f"{short_path(code.co_filename)}:{code.co_name}"
+
+def write_collapsed(path, stacks):
+    """Collapsed stack format (one 'outer;inner count' line per stack), input for flamegraph.pl or speedscope"""
+    with open(path, 'w') as file:
+        for stack, count in sorted(stacks.items()):
+            file.write(f"{stack} {count}\n")
+
+class CProfileSession:
+    """Deterministic profiling, one cProfile.Profile per game state switched on for the frames spent in it"""
+    def __init__(self):
+        self.profiles = {}  # state name -> cProfile.Profile
+        self.active = None
+
+    def begin_frame(self, state):
+        """Profile this frame into state's profile (a frame counts for the state it started in)"""
+        name = state_name(state)
+        if name not in self.profiles:
+            self.profiles[name] = cProfile.Profile()
+        self.active = self.profiles[name]
+        self.active.enable()
+
+    def end_frame(self):
+        if self.active:
+            self.active.disable()
+            self.active = None
+
+    def write(self, directory):
+        """Write <state>.pstats and <state>.collapsed for every state seen, returns the paths"""
+        self.end_frame()
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for name, profile in self.profiles.items():
+            path = os.path.join(directory, f"{name}.pstats")
+            profile.dump_stats(path)
+            paths.append(path)
+
+            path = os.path.join(directory, f"{name}.collapsed")
+            write_collapsed(path, self.collapse(pstats.Stats(profile)))
+            paths.append(path)
+        return paths
+
+    @staticmethod
+    def collapse(stats):
+        """
+        Approximate stacks from the caller -> callee graph, in microseconds of own time
+        A function's time is split between its callers in proportion to the time each call edge took
+        """
+        entries = stats.stats  # func -> (primitive calls, calls, own time, cumulative time, callers)
+        callees = {}
+        for func, (_, _, _, _, callers) in entries.items():
+            for caller, edge in callers.items():
+                callees.setdefault(caller, []).append((func, edge[3]))
+
+        def label(func):
+            filename, _, name = func
+            return f"{short_path(filename) if filename != '~' else 'builtin'}:{name}"
+
+        stacks = Counter()
+        def walk(func, stack, share, seen):
+            _, _, own_time, cumulative_time, _ = entries[func]
+            stack = f"{stack};{label(func)}" if stack else label(func)
+            if own_time * share >= 1e-6:
+                stacks[stack] += round(own_time * share * 1e6)
+            # Branches below a microsecond are dropped, the caller graph can have a huge number of paths
+            if len(seen) >= MAX_STACK_DEPTH or cumulative_time * share < 1e-6:
+                return
+            for callee, edge_time in callees.get(func, ()):
+                callee_time = entries[callee][3]
+                if callee in seen or not callee_time:
+                    continue
+                walk(callee, stack, share * min(1.0, edge_time / callee_time), seen | {callee})
+
+        for func, (_, _, _, _, callers) in entries.items():
+            if not callers:
+                walk(func, "", 1.0, {func})
+        return stacks
+
+class SamplingSession:
+    """
+    Low overhead statistical profiling: a daemon thread records the main thread's stack every interval,
+    the game itself only sets which state the samples belong to
+    """
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        if interval <= 0:
+            raise ValueError(f"sample interval must be greater than 0, got {interval}")
+        self.interval = interval
+        self.state = None  # None between frames (waiting on the frame cap), those samples are skipped
+        self.stacks = {}   # state name -> Counter of collapsed stacks
+        self.labels = {}   # code object -> label
+        self.samples = 0
+        self.main_thread_id = threading.main_thread().ident
+
+        # The sampler only runs when the main thread hands over the GIL, switching more often spreads samples evenly
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self.switch_interval, interval / 4))
+
+        self.running = True
+        self.thread = threading.Thread(target=self._sample_loop, name="stack-sampler", daemon=True)
+        self.thread.start()
+
+    def begin_frame(self, state):
+        self.state = state_name(state)
+
+    def end_frame(self):
+        self.state = None
+
+    def _sample_loop(self):
+        while self.running:
+            time.sleep(self.interval)
+            state = self.state
+            frame = sys._current_frames().get(self.main_thread_id)
+            if state is None or frame is None:
+                continue
+
+            labels = []
+            while frame is not None and len(labels) < MAX_STACK_DEPTH:
+                code = frame.f_code
+                label = self.labels.get(code)
+                if label is None:
+                    label = self.labels[code] = frame_label(code)
+                labels.append(label)
+                frame = frame.f_back
+            labels.reverse()
+
+            if state not in self.stacks:
+                self.stacks[state] = Counter()
+            self.stacks[state][";".join(labels)] += 1
+            self.samples += 1
+
+    def write(self, directory):
+        """Stop sampling and write <state>.collapsed (counts are samples) for every state seen"""
+        self.running = False
+        self.thread.join()
+        sys.setswitchinterval(self.switch_interval)
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for name, stacks in self.stacks.items():
+            path = os.path.join(directory, f"{name}.collapsed")
+            write_collapsed(path, stacks)
+            paths.append(path)
+        return paths
+
+PROFILE_MODES = ('cprofile', 'sample')
+
+def create_session(mode, interval=SAMPLE_INTERVAL):
+    """Profiling session for a --profile mode"""
+    if mode == 'cprofile':
+        return CProfileSession()
+    if mode == 'sample':
+        return SamplingSession(interval)
+    raise ValueError(f"unknown profile mode '{mode}', expected one of {', '.join(PROFILE_MODES)}")
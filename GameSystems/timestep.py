@@ -0,0 +1,29 @@
+from settings import *
+
+class FixedTimestep:
+    """Accumulates real frame time and hands it out as a whole number of fixed simulation steps"""
+    def __init__(self, tick_rate=TICK_RATE, max_steps=MAX_STEPS_PER_FRAME):
+        self.step = 1 / tick_rate  # seconds per simulation step
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.alpha = 0.0  # how far between the last two steps the current frame is (0-1)
+
+    def advance(self, frame_time):
+        """Add frame_time seconds, returns how many steps to simulate this frame"""
+        self.accumulator += frame_time
+        steps = int(self.accumulator // self.step)
+
+        # Under heavy load, catch up at most max_steps and drop the rest instead of spiralling
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = self.accumulator % self.step
+        else:
+            self.accumulator -= steps * self.step
+
+        self.alpha = self.accumulator / self.step
+        return steps
+
+    def reset(self):
+        """Forget accumulated time, e.g. after loading or unpausing"""
+        self.accumulator = 0.0
+        self.alpha = 0.0
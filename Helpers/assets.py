@@ -0,0 +1,127 @@
+import threading
+from collections import OrderedDict
+from settings import *
+
+class AssetManager:
+    """Loads images, fonts and derived surfaces once, converted to the display format and cached"""
+    def __init__(self, memory_budget=ASSET_MEMORY_BUDGET):
+        self.memory_budget = memory_budget
+        self.surfaces = OrderedDict()  # key -> surface, least recently used first
+        self.surface_bytes = 0
+        self.fonts = {}  # (path, size) -> font, fonts are small so they are never evicted
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Levels may be loaded from a worker thread
+        self.lock = threading.RLock()
+
+    # ==================== SURFACES ====================
+    def image(self, path, size=None, alpha=False):
+        """Image from disk converted to the display format, optionally scaled to size"""
+        key = ('image', path, size and tuple(size), alpha)
+        with self.lock:
+            surface = self._get(key)
+            if surface is not None:
+                return surface
+
+            if size:
+                # Scaled variants are derived from the cached original, which is only read once
+                surface = pygame.transform.scale(self.image(path, alpha=alpha), size)
+            else:
+                surface = self._convert(pygame.image.load(path), alpha)
+            return self._store(key, surface)
+
+    def scaled(self, surface, size, alpha=True):
+        """Scaled copy of an in-memory surface (e.g. a tileset tile), shared by everyone asking for it"""
+        key = ('scaled', surface, tuple(size), alpha)
+        with self.lock:
+            cached = self._get(key)
+            if cached is not None:
+                return cached
+
+            # Already the right size (e.g. from a pre-scaled atlas), only the format may need converting
+            if surface.get_size() != tuple(size):
+                surface = pygame.transform.scale(surface, size)
+            return self._store(key, self._convert(surface, alpha))
+
+    def overlay(self, alpha, size=(SCREEN_WIDTH, SCREEN_HEIGHT), colour=(0, 0, 0)):
+        """Solid semi-transparent overlay, built once per alpha/size/colour"""
+        key = ('overlay', alpha, tuple(size), tuple(colour))
+        with self.lock:
+            surface = self._get(key)
+            if surface is not None:
+                return surface
+
+            surface = self._convert(pygame.Surface(size), alpha=False)
+            surface.fill(colour)
+            surface.set_alpha(alpha)  # Adjust transparency (0-255, lower = more transparent)
+            return self._store(key, surface)
+
+    def _convert(self, surface, alpha):
+        """Match the display pixel format so blits are plain copies (needs a display mode to be set)"""
+        if not pygame.display.get_surface():
+            return surface
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    def _get(self, key):
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+        else:
+            self.misses += 1
+        return surface
+
+    def _store(self, key, surface):
+        self.surfaces[key] = surface
+        self.surface_bytes += self._surface_size(surface)
+
+        # Evict least recently used surfaces until back under budget, never the one just added
+        while self.surface_bytes > self.memory_budget and len(self.surfaces) > 1:
+            _, evicted = self.surfaces.popitem(last=False)
+            self.surface_bytes -= self._surface_size(evicted)
+            self.evictions += 1
+        return surface
+
+    @staticmethod
+    def _surface_size(surface):
+        return surface.get_pitch() * surface.get_height()
+
+    # ==================== FONTS ====================
+    def font(self, path, size):
+        """Font loaded once per path and size"""
+        key = (path, size)
+        with self.lock:
+            font = self.fonts.get(key)
+            if font is not None:
+                self.hits += 1
+                return font
+
+            self.misses += 1
+            font = pygame.font.Font(path, size)
+            self.fonts[key] = font
+            return font
+
+    # ==================== STATS ====================
+    def stats(self):
+        """Cache hit/miss counters and memory use"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'surfaces': len(self.surfaces),
+            'fonts': len(self.fonts),
+            'surface_bytes': self.surface_bytes,
+            'memory_budget': self.memory_budget
+        }
+
+    def clear(self):
+        """Drop every cached asset, e.g. after the display mode changes"""
+        with self.lock:
+            self.surfaces.clear()
+            self.fonts.clear()
+            self.surface_bytes = 0
+
+# Shared asset manager, all modules load through it
+ASSETS = AssetManager()
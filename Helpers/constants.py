@@ -10,6 +10,14 @@ IMAGES_PATH = {
     "game_background": "Assets/Images/dead_forest.png"
 }
 
+# Levels, in play order
+LEVEL_PATHS = [
+    "Assets/TiledMaps/level1.tmx"
+]
+
+# Compiled level cache, rebuilt automatically from the TMX files
+COMPILED_LEVELS_PATH = "Assets/Compiled"
+
 # Surface
 SURFACE_PADDING = {
     "left": 40,
@@ -37,4 +45,48 @@ HEALTH_BAR_ATTRIBUTES = {
     "width": 200,
     "height": 20,
     "max_health": 100
-}
\ No newline at end of file
+}
+
+# Level collision
+COLLISION_LAYERS = ["Ground"]  # Tile layers whose tiles are solid by default
+SOLID_PROPERTY = "solid"       # Tile property that overrides solidity per tile (true/false)
+
+# ENEMY_TYPES, speeds are pixels per frame at BASE_FRAME_RATE and ranges are in tiles
+ENEMY_TYPES = {
+    "basic": {
+        "health": 100,
+        "speed": 1.5,
+        "detection_range": 5,
+        "patrol_range": 4,
+        "colour": (120, 20, 160)
+    },
+    "brute": {
+        "health": 250,
+        "speed": 1,
+        "detection_range": 4,
+        "patrol_range": 3,
+        "colour": (90, 40, 20)
+    },
+    "stalker": {
+        "health": 60,
+        "speed": 2.5,
+        "detection_range": 8,
+        "patrol_range": 6,
+        "colour": (30, 110, 60)
+    }
+}
+ENEMY_SEARCH_TIME = 3  # Seconds an enemy keeps looking where it last saw the hero before patrolling again
+
+# PROJECTILE_ATTRIBUTES per weapon type, speed is pixels per frame at BASE_FRAME_RATE and size is in pixels
+PROJECTILE_ATTRIBUTES = {
+    "ranged": {
+        "speed": 12,
+        "size": 6,
+        "colour": (200, 160, 90)
+    },
+    "magic": {
+        "speed": 8,
+        "size": 10,
+        "colour": (120, 200, 255)
+    }
+}
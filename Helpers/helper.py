@@ -1,50 +1,38 @@
 import pygame
 from settings import SCREEN_HEIGHT, SCREEN_WIDTH
+from Helpers.assets import ASSETS
+from GameSystems.events import EVENTS, AssetEvent
 
 def load_background_image(image_path):
         """Load and scale background image to fit screen"""
         try:
-            # Load the image
-            original_image = pygame.image.load(image_path)
-            print(f"Background image '{image_path}' loaded successfully!")
-
-            # Scale the image to fit the screen while maintaining aspect ratio
-            return pygame.transform.scale(original_image, (SCREEN_WIDTH, SCREEN_HEIGHT))
+            # Load the image (converted and cached by the asset manager) scaled to fit the screen
+            background_image = ASSETS.image(image_path, (SCREEN_WIDTH, SCREEN_HEIGHT))
+            EVENTS.emit(AssetEvent(image_path, "background image", True))
+            return background_image
 
         except pygame.error as e:
-            print(f"Could not load background image '{image_path}': {e}")
-            print("Main menu will use solid color background instead.")
+            EVENTS.emit(AssetEvent(image_path, "background image", False, f"{e}, using a solid colour instead"))
             return None
         except FileNotFoundError:
-            print(f"Background image file '{image_path}' not found.")
-            print("Main menu will use solid color background instead.")
+            EVENTS.emit(AssetEvent(image_path, "background image", False, "file not found, using a solid colour instead"))
             return None
 
 def load_font(font_path, size):
         """Load custom font or fall back to default font"""
         try:
             # Try to load custom font
-            custom_font = pygame.font.Font(font_path, size)
-            print(f"Custom font '{font_path}' loaded successfully!")
+            custom_font = ASSETS.font(font_path, size)
+            EVENTS.emit(AssetEvent(font_path, "font", True))
             return custom_font
             
         except pygame.error as e:
-            print(f"Could not load font '{font_path}': {e}")
-            print(f"Using default font at size {size} instead.")
-            return pygame.font.Font(None, size)
-        except FileNotFoundError:
-            print(f"Font file '{font_path}' not found.")
-            print(f"Using default font at size {size} instead.")
-            return pygame.font.Font(None, size)
+            EVENTS.emit(AssetEvent(font_path, "font", False, f"{e}, using the default font at size {size} instead"))
+            return ASSETS.font(None, size)
         except FileNotFoundError:
-            print(f"Background image file '{image_path}' not found.")
-            print("Main menu will use solid color background instead.")
-            self.background_image = None
+            EVENTS.emit(AssetEvent(font_path, "font", False, f"file not found, using the default font at size {size} instead"))
+            return ASSETS.font(None, size)
 
 def load_semi_transparent_overlay(alpha):
-    # Semi-transparent overlay for better text readability
-    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-    overlay.set_alpha(alpha)  # Adjust transparency (0-255, lower = more transparent)
-    overlay.fill((0, 0, 0))  # Black overlay
-    return overlay
-    self.screen.blit(overlay, (0, 0))
+    # Semi-transparent overlay for better text readability, built once per alpha and reused
+    return ASSETS.overlay(alpha)
@@ -0,0 +1,77 @@
+from collections import OrderedDict
+from settings import *
+
+# Offsets the outline copy is blitted at, for each outline style
+OUTLINE_OFFSETS = {
+    "ring": [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx != 0 or dy != 0],
+    "shadow": [(1, 1)]
+}
+
+class TextCache:
+    """LRU cache of rendered text, each entry a single surface with its outline baked in"""
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (surface, text_rect relative to surface)
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, colour, outline_colour=None, outline_width=0, outline_style="ring"):
+        """Return (surface, text_rect), text_rect being where the text itself sits inside surface"""
+        key = (font, text, tuple(colour), outline_colour and tuple(outline_colour), outline_width, outline_style)
+        entry = self.entries.get(key)
+        if entry:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        entry = self._compose(font, text, colour, outline_colour, outline_width, outline_style)
+        self.entries[key] = entry
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return entry
+
+    def _compose(self, font, text, colour, outline_colour, outline_width, outline_style):
+        """Render text once and its outline once, then stamp them together onto one surface"""
+        text_surface = font.render(text, True, colour)
+        if not outline_colour or not outline_width:
+            return text_surface, text_surface.get_rect()
+
+        outline_surface = font.render(text, True, outline_colour)
+        offsets = [(dx * outline_width, dy * outline_width) for dx, dy in OUTLINE_OFFSETS[outline_style]]
+
+        # Pad the surface so outline copies on every side still fit
+        pad_left = -min(0, *(dx for dx, dy in offsets))
+        pad_top = -min(0, *(dy for dx, dy in offsets))
+        pad_right = max(0, *(dx for dx, dy in offsets))
+        pad_bottom = max(0, *(dy for dx, dy in offsets))
+
+        width, height = text_surface.get_size()
+        surface = pygame.Surface((width + pad_left + pad_right, height + pad_top + pad_bottom), pygame.SRCALPHA)
+        for dx, dy in offsets:
+            surface.blit(outline_surface, (pad_left + dx, pad_top + dy))
+        surface.blit(text_surface, (pad_left, pad_top))
+
+        if pygame.display.get_surface():
+            surface = surface.convert_alpha()
+        return surface, text_surface.get_rect(topleft=(pad_left, pad_top))
+
+    def invalidate_font(self, font):
+        """Drop every entry rendered with font, call when a font is resized or replaced"""
+        for key in [key for key in self.entries if key[0] is font]:
+            del self.entries[key]
+
+    def clear(self):
+        self.entries.clear()
+
+# Shared cache for all menus and overlays
+TEXT_CACHE = TextCache()
+
+def draw_text(screen, font, text, colour, center, outline_colour=None, outline_width=0, outline_style="ring"):
+    """Blit cached text centred on center (the outline doesn't shift it), returns the rect drawn"""
+    surface, text_rect = TEXT_CACHE.render(font, text, colour, outline_colour, outline_width, outline_style)
+
+    # Place the text itself at center, then shift back by where it sits inside the composite
+    target_rect = text_rect.copy()
+    target_rect.center = center
+    return screen.blit(surface, (target_rect.x - text_rect.x, target_rect.y - text_rect.y))
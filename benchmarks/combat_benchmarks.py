@@ -0,0 +1,83 @@
+import numpy as np
+from settings import *
+from GameItems.weapons import WEAPONS
+from GameActions.combat import AttackHandler, TargetIndex
+from GameActions.projectiles import ProjectileSystem
+from GameLevels.compiled import load_level
+from GameLevels.tilemap import TileMap
+from Characters.enemy import EnemySystem
+from benchmarks.registry import benchmark
+
+class Target:
+    """Minimal attack target, a rect that soaks up damage"""
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(x, y, SCALED_TILE_SIZE, SCALED_TILE_SIZE)
+        self.health = 100
+
+    def take_damage(self, damage):
+        self.health -= damage
+
+def weapon_attack_area(weapon):
+    return lambda: weapon.get_attack_area(10, 10, (1, 0))
+
+def attack_hits(target_count):
+    """magic_blast fired from the centre of a square crowd of target_count targets, one per tile, indexed once"""
+    side = max(1, int(target_count ** 0.5))
+    targets = [Target((i % side) * SCALED_TILE_SIZE, (i // side) * SCALED_TILE_SIZE) for i in range(target_count)]
+    target_index = TargetIndex.from_targets(targets)
+
+    attacker = Target(side // 2 * SCALED_TILE_SIZE, side // 2 * SCALED_TILE_SIZE)
+    handler = AttackHandler(attacker)
+    handler.equip_weapon('magic_blast')
+    attack_info = handler.perform_attack((1, 0))
+
+    return lambda: handler.process_attack_hits(attack_info, target_index)
+
+for weapon_name, weapon in WEAPONS.items():
+    benchmark(f'weapon/get_attack_area/{weapon_name}', number=10000)(
+        lambda weapon=weapon: weapon_attack_area(weapon)
+    )
+
+for target_count in (10, 100, 1000, 10000):
+    benchmark(f'combat/process_attack_hits/targets={target_count}', number=200)(
+        lambda target_count=target_count: attack_hits(target_count)
+    )
+
+def attack_preview(weapon_name):
+    """Attack preview held on screen, as drawn every frame while the attack key is down"""
+    attacker = Target(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+    handler = AttackHandler(attacker)
+    handler.equip_weapon(weapon_name)
+    screen = pygame.display.get_surface()
+    return lambda: handler.draw_attack_preview(screen, (1, 0))
+
+for weapon_name in WEAPONS:
+    benchmark(f'combat/draw_attack_preview/{weapon_name}', number=2000)(
+        lambda weapon_name=weapon_name: attack_preview(weapon_name)
+    )
+
+def projectile_swarm(projectile_count):
+    """projectile_count arrows in random directions over the first level's open tiles, 1000 enemies to hit"""
+    tile_map = TileMap(load_level(LEVEL_PATHS[0]))
+    enemies = EnemySystem(tile_map)
+    projectiles = ProjectileSystem(tile_map, capacity=projectile_count)
+
+    rng = np.random.default_rng(0)
+    open_tiles = np.argwhere(~tile_map.solid)[:, ::-1]
+    for x, y in open_tiles[rng.integers(len(open_tiles), size=1000)].tolist():
+        enemies.spawn((x * SCALED_TILE_SIZE, y * SCALED_TILE_SIZE))
+    enemies.health[:] = np.inf  # nobody dies, so every run sees the same crowd
+
+    def update():
+        # Refill the pool each run, the benchmark measures a steady swarm
+        projectiles.clear()
+        angles = rng.uniform(0, 2 * np.pi, projectile_count)
+        projectiles.spawn_many(((open_tiles[rng.integers(len(open_tiles), size=projectile_count)] + 0.5) * SCALED_TILE_SIZE),
+                               np.stack((np.cos(angles), np.sin(angles)), axis=1), 'ranged', 5, 40 * SCALED_TILE_SIZE)
+        projectiles.update(1 / TICK_RATE, enemies.target_index())
+    return update
+
+for projectile_count in (100, 1000, 4000):
+    benchmark(f'projectiles/update/count={projectile_count}', number=100)(
+        lambda projectile_count=projectile_count: projectile_swarm(projectile_count)
+    )
@@ -0,0 +1,70 @@
+import numpy as np
+from settings import *
+from Helpers.constants import *
+from GameLevels.compiled import load_level
+from GameLevels.tilemap import TileMap
+from Characters.enemy import EnemySystem
+from GameAI.line_of_sight import LineOfSight
+from GameAI.pathfinding import FlowField, PathFinder
+from benchmarks.registry import benchmark
+
+def enemy_horde(enemy_count):
+    """enemy_count enemies of every type scattered over the open tiles of the first level, hero in the middle"""
+    tile_map = TileMap(load_level(LEVEL_PATHS[0]))
+    flow_field = FlowField(tile_map)
+    enemies = EnemySystem(tile_map, flow_field=flow_field)
+
+    rng = np.random.default_rng(0)
+    open_tiles = np.argwhere(~tile_map.solid)
+    enemy_types = list(ENEMY_TYPES)
+    for i in range(enemy_count):
+        y, x = open_tiles[rng.integers(len(open_tiles))]
+        enemies.spawn((x * SCALED_TILE_SIZE, y * SCALED_TILE_SIZE), enemy_types[i % len(enemy_types)])
+
+    target = (tile_map.world_size[0] / 2, tile_map.world_size[1] / 2)
+    flow_field.update(target)
+    return lambda: enemies.update(1 / TICK_RATE, target)
+
+for enemy_count in (100, 1000, 10000):
+    benchmark(f'enemies/update/count={enemy_count}', number=200)(
+        lambda enemy_count=enemy_count: enemy_horde(enemy_count)
+    )
+
+def line_of_sight_batch(source_count):
+    """source_count uncached rays of up to 8 tiles towards the middle of the first level"""
+    tile_map = TileMap(load_level(LEVEL_PATHS[0]))
+    line_of_sight = LineOfSight(tile_map)
+
+    rng = np.random.default_rng(0)
+    target = np.array(tile_map.world_size, dtype=np.float32) / 2
+    sources = target + rng.uniform(-8, 8, (source_count, 2)) * SCALED_TILE_SIZE
+
+    def cast():
+        line_of_sight.new_tick()
+        line_of_sight.visible_batch(sources, target)
+    return cast
+
+for source_count in (100, 1000, 10000):
+    benchmark(f'ai/line_of_sight/sources={source_count}', number=200)(
+        lambda source_count=source_count: line_of_sight_batch(source_count)
+    )
+
+@benchmark('ai/flow_field/recompute', number=200)
+def flow_field_recompute():
+    tile_map = TileMap(load_level(LEVEL_PATHS[0]))
+    flow_field = FlowField(tile_map)
+    flow_field.target_tile = tuple(np.argwhere(~tile_map.solid)[0][::-1].tolist())
+    return flow_field.recompute
+
+@benchmark('ai/path_finder/uncached', number=50)
+def path_finder_uncached():
+    """Longest path between two open tiles of the first level, with the cache cleared every time"""
+    tile_map = TileMap(load_level(LEVEL_PATHS[0]))
+    path_finder = PathFinder(tile_map)
+    open_tiles = np.argwhere(~tile_map.solid)[:, ::-1].tolist()
+    start, goal = tuple(open_tiles[0]), tuple(open_tiles[-1])
+
+    def find_path():
+        path_finder.invalidate()
+        path_finder.find_path(start, goal)
+    return find_path
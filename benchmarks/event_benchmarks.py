@@ -0,0 +1,22 @@
+import io
+from settings import *
+from GameSystems.events import EventBus, EventLog, HitEvent
+from benchmarks.registry import benchmark
+
+def hit_burst(event_count):
+    """event_count hits emitted and dispatched in one tick, logged (rate limited) to an in-memory stream"""
+    bus = EventBus()
+    event_log = EventLog(bus, logger_name=f"{GAME_NAME}.benchmark.{event_count}", stream=io.StringIO())
+    event_log.start()
+    bus.subscribe(HitEvent, lambda events: None)
+
+    def run():
+        for i in range(event_count):
+            bus.emit(HitEvent(i, 10, "benchmark"))
+        bus.dispatch()
+    return run
+
+for event_count in (10, 100, 1000):
+    benchmark(f'events/emit_dispatch/count={event_count}', number=200)(
+        lambda event_count=event_count: hit_burst(event_count)
+    )
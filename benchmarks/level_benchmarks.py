@@ -0,0 +1,61 @@
+from settings import *
+from pytmx.util_pygame import load_pygame
+from GameLevels.level import Level
+from GameLevels.compiled import load_level
+from GameLevels.groups import SpatialHashGroup
+from GameLevels.sprites import Collider
+from Characters.hero import Hero
+from GameSystems.input import ScriptedInput, DEFAULT_SCRIPT
+from benchmarks.registry import benchmark
+
+@benchmark('level/load_and_setup', number=3, repeat=3)
+def level_load_and_setup():
+    return lambda: Level(load_pygame(LEVEL_PATHS[0]))
+
+@benchmark('level/load_compiled_and_setup', number=10, repeat=3)
+def level_load_compiled_and_setup():
+    load_level(LEVEL_PATHS[0])  # make sure the cache is built before timing
+    return lambda: Level(load_level(LEVEL_PATHS[0]))
+
+@benchmark('level/draw', number=100)
+def level_draw():
+    level = Level(load_level(LEVEL_PATHS[0]), ScriptedInput(DEFAULT_SCRIPT))
+    return lambda: level.draw(full=True)
+
+@benchmark('level/draw/dirty_rects', number=100)
+def level_draw_dirty_rects():
+    """Camera holding still, only the areas under moving things are redrawn"""
+    level = Level(load_level(LEVEL_PATHS[0]), ScriptedInput(DEFAULT_SCRIPT))
+    level.draw()
+    return level.draw
+
+@benchmark('level/update', number=500)
+def level_update():
+    input_source = ScriptedInput(DEFAULT_SCRIPT)
+    level = Level(load_level(LEVEL_PATHS[0]), input_source)
+
+    def update():
+        level.update()
+        input_source.advance()
+    return update
+
+def hero_collision(collider_count):
+    """Hero landing on the middle of a floor made of collider_count single-tile colliders"""
+    collision_sprites = SpatialHashGroup()
+    for i in range(collider_count):
+        Collider((i * SCALED_TILE_SIZE, 0, SCALED_TILE_SIZE, SCALED_TILE_SIZE), collision_sprites)
+
+    hero = Hero((0, 0), pygame.sprite.Group(), collision_sprites)
+    start = pygame.FRect(collider_count // 2 * SCALED_TILE_SIZE, -SCALED_TILE_SIZE - 4, SCALED_TILE_SIZE, SCALED_TILE_SIZE)
+
+    def check_collision():
+        hero.old_rect = start.copy()
+        hero.rect = start.move(0, 8)
+        hero._check_collision('horizontal')
+        hero._check_collision('vertical')
+    return check_collision
+
+for collider_count in (100, 1000, 10000):
+    benchmark(f'hero/check_collision/colliders={collider_count}', number=2000)(
+        lambda collider_count=collider_count: hero_collision(collider_count)
+    )
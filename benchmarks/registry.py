@@ -0,0 +1,69 @@
+import json
+import platform
+import statistics
+import timeit
+from datetime import datetime, timezone
+from settings import pygame
+
+# name -> (factory, number, repeat), factories do their setup and return the callable to time
+BENCHMARKS = {}
+
+def benchmark(name, number=100, repeat=5):
+    """Register a benchmark factory under name"""
+    def register(factory):
+        BENCHMARKS[name] = (factory, number, repeat)
+        return factory
+    return register
+
+def run_benchmarks(name_filter=None):
+    """Time every registered benchmark, returns results keyed by name (seconds per call)"""
+    results = {}
+    for name, (factory, number, repeat) in BENCHMARKS.items():
+        if name_filter and name_filter not in name:
+            continue
+
+        func = factory()
+        func()  # warm up caches before timing
+        timings = [total / number for total in timeit.repeat(func, number=number, repeat=repeat)]
+
+        results[name] = {
+            'min': min(timings),
+            'median': statistics.median(timings),
+            'mean': statistics.mean(timings),
+            'number': number,
+            'repeat': repeat
+        }
+        print(f"{name:<45} median {results[name]['median'] * 1000:10.4f} ms   min {results[name]['min'] * 1000:10.4f} ms")
+    return results
+
+def save_results(results, path):
+    """Write results to JSON together with a description of the machine they came from"""
+    report = {
+        'meta': {
+            'created': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'machine': platform.machine()
+        },
+        'results': results
+    }
+    with open(path, 'w') as file:
+        json.dump(report, file, indent=2)
+
+def compare_to_baseline(results, baseline_path, threshold):
+    """
+    Compare medians against a stored run
+    Returns list of (name, baseline, current, ratio) for benchmarks slower by more than threshold
+    """
+    with open(baseline_path) as file:
+        baseline = json.load(file)['results']
+
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result['median'] / baseline[name]['median']
+        if ratio > 1 + threshold:
+            regressions.append((name, baseline[name]['median'], result['median'], ratio))
+    return regressions
@@ -0,0 +1,44 @@
+"""
+Benchmark suite for the load, update, draw and collision hot paths
+
+    python -m benchmarks.run [--filter NAME] [--output results.json] [--baseline baseline.json]
+
+Exits with status 1 when any benchmark is slower than the baseline by more than --threshold
+"""
+import sys
+import argparse
+from GameSystems.headless import use_dummy_video_driver
+from settings import *
+from benchmarks.registry import run_benchmarks, save_results, compare_to_baseline
+import benchmarks.level_benchmarks
+import benchmarks.combat_benchmarks
+import benchmarks.enemy_benchmarks
+import benchmarks.event_benchmarks
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite")
+    parser.add_argument('--filter', default=None, help="only run benchmarks whose name contains this")
+    parser.add_argument('--output', default='bench_results.json', help="where to write the JSON results")
+    parser.add_argument('--baseline', default=None, help="JSON results of an earlier run to compare against")
+    parser.add_argument('--threshold', type=float, default=0.15, help="allowed slowdown before flagging (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    # Level benchmarks need a display surface to convert to, but never a window
+    use_dummy_video_driver()
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    results = run_benchmarks(args.filter)
+    save_results(results, args.output)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, args.threshold)
+        for name, baseline, current, ratio in regressions:
+            print(f"REGRESSION {name}: {baseline * 1000:.4f} ms -> {current * 1000:.4f} ms ({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,21 @@
-from os.path import join
 from settings import *
+import argparse
 from enum import Enum
 from Characters.player import Player
 from GameEnvironment.in_game_included import environment_objects
 from GlobalColours.colour_config import G_COLOURS
 from Helpers.helper import *
-from GameLevels.level import Level
-from pytmx.util_pygame import load_pygame
+from Helpers.text import TEXT_CACHE, draw_text
+from GameSystems.loading import LevelLoader
+from GameSystems.headless import use_dummy_video_driver
+from GameSystems.input import ScriptedInput, DEFAULT_SCRIPT
+from GameSystems.timestep import FixedTimestep
+from GameSystems.screen_cache import StaticScreen
+from GameSystems.events import EVENTS, EVENT_LOG, HitEvent, get_logger
+from GameSystems.profiler import PROFILER
+from GameSystems.session_profiler import PROFILE_MODES, SAMPLE_INTERVAL, create_session, LOG as PROFILE_LOG
+
+LOG = get_logger("game")
 
 class GameState(Enum):
     MAIN_MENU = "main_menu"
@@ -14,9 +23,25 @@ class GameState(Enum):
     PAUSED = "paused"
     GAME_OVER = "game_over"
     SETTINGS = "settings"
+    LOADING = "loading"
+
+# States whose screen only changes on input, they are drawn once and then left alone
+STATIC_STATES = (GameState.MAIN_MENU, GameState.PAUSED, GameState.GAME_OVER)
+
+# Window events after which the whole screen has to be pushed again
+WINDOW_EVENTS = (pygame.VIDEOEXPOSE, pygame.VIDEORESIZE, pygame.WINDOWEXPOSED, pygame.WINDOWRESIZED,
+                 pygame.WINDOWSIZECHANGED, pygame.WINDOWRESTORED)
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False, input_source=None):
+        # Headless runs render to SDL's dummy driver, no window is opened
+        if headless:
+            use_dummy_video_driver()
+        self.input_source = input_source
+
+        # Game events are logged from a writer thread, nothing on the game loop waits for the terminal
+        EVENT_LOG.start()
+
         # Initialize Pygame
         pygame.init()
         
@@ -30,8 +55,9 @@ class Game:
         self.screen_center_x = SCREEN_WIDTH // 2
         self.screen_center_y = SCREEN_HEIGHT // 2
         
-        # Clock for controlling frame rate
+        # Clock for controlling frame rate, simulation runs in fixed steps independent of it
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep()
         
         # Game state
         self.current_state = GameState.MAIN_MENU
@@ -40,16 +66,15 @@ class Game:
         # Game objects (initialized when game starts)
         self.player = None
         self.environment_objects = []
-        
-        # Menu properties (dynamic font sizes based on screen height)
-        # Load custom fonts or fall back to default
-        self.title_font_size = int(self.screen_height * 0.12)  # 12% of screen height
-        self.menu_font_size = int(self.screen_height * 0.06)   # 6% of screen height
-        self.small_font_size = int(self.screen_height * 0.04)  # 4% of screen height
-        
-        self.font = load_font(PRIMARY_FONT, self.title_font_size)
-        self.menu_font = load_font(PRIMARY_FONT, self.menu_font_size)
-        self.small_font = load_font(PRIMARY_FONT, self.small_font_size)
+
+        # Last composed menu/pause/game over frame, and the gameplay frame frozen behind the pause menu
+        self.static_screen = StaticScreen()
+        self.pause_snapshot = None
+        self.screen_holds_gameplay = False  # the last frame drawn was a clean gameplay frame, it can be patched
+        
+        # Menu fonts (sized from the screen height)
+        self.font = self.menu_font = self.small_font = None
+        self.load_fonts()
 
         # Menu properties
         self.selected_menu_item = 0
@@ -65,63 +90,184 @@ class Game:
         self.background_image_main_menu = load_background_image(IMAGES_PATH["main_menu_background"])
         self.background_image_game = load_background_image(IMAGES_PATH["game_background"])
 
-        # Levels
-        self.tmx_maps = {0: load_pygame(join('Assets', 'TiledMaps', 'level1.tmx'))}
-        self.current_level = Level(self.tmx_maps[0])
+        # Levels load on a background thread, the first one starts while the main menu is shown
+        self.level_loader = LevelLoader(LEVEL_PATHS, self.input_source)
+        self.current_level_index = 0
+        self.current_level = None
+        self.level_loader.request(self.current_level_index)
+        
+    def load_fonts(self):
+        """(Re)load menu fonts at sizes based on the screen height, dropping text cached with the old ones"""
+        for old_font in (self.font, self.menu_font, self.small_font):
+            if old_font:
+                TEXT_CACHE.invalidate_font(old_font)
+
+        # Menu properties (dynamic font sizes based on screen height)
+        # Load custom fonts or fall back to default
+        self.title_font_size = int(self.screen_height * 0.12)  # 12% of screen height
+        self.menu_font_size = int(self.screen_height * 0.06)   # 6% of screen height
+        self.small_font_size = int(self.screen_height * 0.04)  # 4% of screen height
         
-    def run(self):
-        """Main game loop - single loop for all states"""
+        self.font = load_font(PRIMARY_FONT, self.title_font_size)
+        self.menu_font = load_font(PRIMARY_FONT, self.menu_font_size)
+        self.small_font = load_font(PRIMARY_FONT, self.small_font_size)
+
+    def run(self, max_frames=None, session_profiler=None, profile_dir="profiles"):
+        """
+        Main game loop - single loop for all states
+        Stops by itself after max_frames if given, a session profiler records each frame under its GameState
+        """
+        frames = 0
         while self.running:
-            # Control frame rate
-            self.clock.tick(60)
+            # A menu already on screen sleeps until something happens instead of redrawing at FPS
+            if self.is_idle():
+                self.wait_for_input()
+
+            # Control frame rate, frame_time is the real time the last frame took
+            frame_time = self.clock.tick(FPS) / 1000
+            PROFILER.begin_frame()
+            if session_profiler:
+                session_profiler.begin_frame(self.current_state)
 
             # Handle events based on current state
-            self.handle_events()
+            with PROFILER.scope("events"):
+                self.handle_events()
             
-            # Update game state
-            self.update()
+            # Update game state in fixed steps, catching up on slow frames
+            for _ in range(self.timestep.advance(frame_time)):
+                with PROFILER.scope("update"):
+                    self.update()
             
             # Draw everything
-            self.draw()
+            with PROFILER.scope("draw"):
+                self.draw()
+            PROFILER.end_frame()
+
+            if session_profiler:
+                session_profiler.end_frame()
+            frames += 1
+            if max_frames is not None and frames >= max_frames:
+                self.running = False
         
         # Clean up
+        if session_profiler:
+            for path in session_profiler.write(profile_dir):
+                PROFILE_LOG.info("wrote %s", path)
+        if PROFILER.tracing:
+            PROFILER.stop_trace()
+        self.level_loader.shutdown()
+        EVENTS.dispatch()
+        EVENT_LOG.stop()
         pygame.quit()
         sys.exit()
     
+    def is_idle(self):
+        """True while a static screen is shown unchanged, nothing needs drawing until input arrives"""
+        return (self.current_state in STATIC_STATES and not PROFILER.show_overlay
+                and self.static_screen.is_current(self.static_screen_key()))
+
+    def wait_for_input(self):
+        """Block (no CPU) until an event arrives or STATIC_SCREEN_WAIT passes, then handle that event"""
+        event = pygame.event.wait(STATIC_SCREEN_WAIT)
+        if event.type != pygame.NOEVENT:
+            self.handle_event(event)
+
     def handle_events(self):
-        """Handle events based on current game state"""
+        """Handle the queued events based on current game state"""
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
-            elif self.current_state == GameState.MAIN_MENU:
-                self.handle_main_menu_events(event)
-            elif self.current_state == GameState.PLAYING:
-                self.handle_gameplay_events(event)
-            elif self.current_state == GameState.PAUSED:
-                self.handle_pause_events(event)
-            elif self.current_state == GameState.GAME_OVER:
-                self.handle_game_over_events(event)
+            self.handle_event(event)
+
+    def handle_event(self, event):
+        """Handle one event based on current game state"""
+        if event.type == pygame.QUIT:
+            self.running = False
+        elif event.type in WINDOW_EVENTS:
+            self.static_screen.invalidate()
+            self.pause_snapshot = None
+            self.screen_holds_gameplay = False
+        elif event.type == pygame.KEYDOWN and event.key in (pygame.K_F3, pygame.K_F4):
+            self.handle_profiler_keys(event)
+        elif self.current_state == GameState.MAIN_MENU:
+            self.handle_main_menu_events(event)
+        elif self.current_state == GameState.PLAYING:
+            self.handle_gameplay_events(event)
+        elif self.current_state == GameState.PAUSED:
+            self.handle_pause_events(event)
+        elif self.current_state == GameState.GAME_OVER:
+            self.handle_game_over_events(event)
     
+    def handle_profiler_keys(self, event):
+        """F3 shows the frame profiler overlay, F4 starts/stops recording a Chrome trace"""
+        if event.key == pygame.K_F3:
+            PROFILER.toggle_overlay()
+        elif PROFILER.tracing:
+            PROFILER.stop_trace()
+        else:
+            PROFILER.start_trace()
+
     def update(self):
         """Update game logic based on current state"""
         if self.current_state == GameState.PLAYING:
             self.update_gameplay()
+        elif self.current_state == GameState.LOADING:
+            self.update_loading()
         # Other states don't need continuous updates
+
+        # Everything that happened this tick goes to the subscribers in one batch
+        EVENTS.dispatch()
     
     def draw(self):
         """Draw everything based on current state"""
-        self.screen.fill(G_COLOURS.background)
+        if self.current_state in STATIC_STATES and not PROFILER.show_overlay:
+            self.screen_holds_gameplay = False
+            self.draw_static_screen()
+            return
+        self.static_screen.invalidate()
+
+        # Gameplay covers the whole screen itself, and may only patch the parts that changed
+        dirty_rects = None
+        if self.current_state != GameState.PLAYING:
+            self.screen.fill(G_COLOURS.background)
         
         if self.current_state == GameState.MAIN_MENU:
             self.draw_main_menu()
         elif self.current_state == GameState.PLAYING:
-            self.draw_gameplay()
+            dirty_rects = self.draw_gameplay(full=not self.screen_holds_gameplay or PROFILER.show_overlay)
         elif self.current_state == GameState.PAUSED:
             self.draw_pause_menu()
         elif self.current_state == GameState.GAME_OVER:
             self.draw_game_over()
-        
-        pygame.display.flip()
+        elif self.current_state == GameState.LOADING:
+            self.draw_loading()
+
+        PROFILER.draw_overlay(self.screen)
+        self.screen_holds_gameplay = self.current_state == GameState.PLAYING and not PROFILER.show_overlay
+        with PROFILER.scope("present"):
+            if dirty_rects is None:
+                pygame.display.flip()
+            elif dirty_rects:
+                pygame.display.update(dirty_rects)
+    
+    def static_screen_key(self):
+        """Everything a static screen's picture depends on"""
+        return self.current_state, self.selected_menu_item, self.screen.get_size()
+
+    def draw_static_screen(self):
+        """Compose a menu/pause/game over screen only when its key changed, then push just the changed regions"""
+        key = self.static_screen_key()
+        if self.static_screen.is_current(key):
+            return
+
+        self.screen.fill(G_COLOURS.background)
+        if self.current_state == GameState.MAIN_MENU:
+            self.draw_main_menu()
+        elif self.current_state == GameState.PAUSED:
+            self.draw_pause_menu()
+        elif self.current_state == GameState.GAME_OVER:
+            self.draw_game_over()
+
+        with PROFILER.scope("present"):
+            self.static_screen.present(self.screen, key)
     
     # ==================== MAIN MENU ====================
     def handle_main_menu_events(self, event):
@@ -176,20 +322,9 @@ class Game:
         self.screen.blit(load_semi_transparent_overlay(110), (0, 0))
 
         # Draw title (dynamic positioning) - with outline for better visibility
-        title_text = self.font.render(GAME_NAME, True, (255, 255, 255))
-        title_outline = self.font.render(GAME_NAME, True, (0, 0, 0))
         title_y = int(self.screen_height * self.title_y_percent)
-        
-        # Draw outline (offset by 2 pixels in each direction)
-        for dx in [-2, 0, 2]:
-            for dy in [-2, 0, 2]:
-                if dx != 0 or dy != 0:  # Don't draw at center position yet
-                    outline_rect = title_outline.get_rect(center=(self.screen_center_x + dx, title_y + dy))
-                    self.screen.blit(title_outline, outline_rect)
-        
-        # Draw main title text
-        title_rect = title_text.get_rect(center=(self.screen_center_x, title_y))
-        self.screen.blit(title_text, title_rect)
+        draw_text(self.screen, self.font, GAME_NAME, (255, 255, 255), (self.screen_center_x, title_y),
+                  outline_colour=(0, 0, 0), outline_width=2)
         
         # Draw menu items (with outline for better visibility)
         menu_start_y = int(self.screen_height * self.menu_start_y_percent)
@@ -197,34 +332,14 @@ class Game:
         
         for i, item in enumerate(self.menu_items):
             color = (255, 255, 0) if i == self.selected_menu_item else (255, 255, 255)
-            text = self.menu_font.render(item, True, color)
-            text_outline = self.menu_font.render(item, True, (0, 0, 0))
-            
             item_y = menu_start_y + (i * item_spacing)
-            
-            # Draw outline
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    if dx != 0 or dy != 0:
-                        outline_rect = text_outline.get_rect(center=(self.screen_center_x + dx, item_y + dy))
-                        self.screen.blit(text_outline, outline_rect)
-            
-            # Draw main text
-            text_rect = text.get_rect(center=(self.screen_center_x, item_y))
-            self.screen.blit(text, text_rect)
+            draw_text(self.screen, self.menu_font, item, color, (self.screen_center_x, item_y),
+                      outline_colour=(0, 0, 0), outline_width=1)
         
-        # Draw controls hint (with outline)
-        hint_text = self.small_font.render("Use arrow keys and Enter, or click to select", True, (128, 128, 128))
-        hint_outline = self.small_font.render("Use arrow keys and Enter, or click to select", True, (0, 0, 0))
+        # Draw controls hint (with a drop shadow)
         hint_y = int(self.screen_height * self.hint_y_percent)
-        
-        # Draw outline
-        outline_rect = hint_outline.get_rect(center=(self.screen_center_x + 1, hint_y + 1))
-        self.screen.blit(hint_outline, outline_rect)
-        
-        # Draw main hint text
-        hint_rect = hint_text.get_rect(center=(self.screen_center_x, hint_y))
-        self.screen.blit(hint_text, hint_rect)
+        draw_text(self.screen, self.small_font, "Use arrow keys and Enter, or click to select", (128, 128, 128),
+                  (self.screen_center_x, hint_y), outline_colour=(0, 0, 0), outline_width=1, outline_style="shadow")
     
     # ==================== GAMEPLAY ====================
     def start_game(self):
@@ -235,14 +350,53 @@ class Game:
         # Initialize environment
         self.environment_objects = environment_objects
         
+        # Play straight away if the level is loaded, otherwise wait for it on the loading screen
+        if self.current_level or self.level_loader.ready(self.current_level_index):
+            self.enter_level()
+        else:
+            self.current_state = GameState.LOADING
+
+    def enter_level(self):
+        """Take the loaded level, start playing it and prefetch the one after it, back to the main menu if loading failed"""
+        if not self.current_level:
+            try:
+                self.current_level = self.level_loader.take(self.current_level_index)
+            except Exception:
+                LOG.exception("could not load level %s", self.level_loader.level_paths[self.current_level_index])
+                self.level_loader.discard(self.current_level_index)  # Play tries loading it again
+                self.current_state = GameState.MAIN_MENU
+                return
+        self.level_loader.prefetch(self.current_level_index + 1)
+
+        # Attacks come from the level's Hero in world space, and shots fly through this level
+        if self.player:
+            self.player.attack_handler.hero = self.current_level.hero
+            self.player.attack_handler.projectiles = self.current_level.projectiles
+
         # Change to playing state
         self.current_state = GameState.PLAYING
+        self.timestep.reset()
+
+    def advance_level(self):
+        """Move on to the next level, it is usually prefetched already so there's no loading screen"""
+        self.current_level_index += 1
+        self.current_level = None
+        self.level_loader.request(self.current_level_index)
+        if self.level_loader.ready(self.current_level_index):
+            self.enter_level()
+        else:
+            self.current_state = GameState.LOADING
+
+    def level_cleared(self):
+        """Every enemy the level started with is dead and there is another level to go to"""
+        enemies = self.current_level.enemies
+        return enemies.count and not enemies.alive_count and self.current_level_index + 1 < len(self.level_loader.level_paths)
 
     def handle_gameplay_events(self, event):
         """Handle gameplay events"""
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
-                self.current_state = GameState.PAUSED
+                self.pause_game()
         
         # Let level events
         self.current_level.handle_level_events(event)
@@ -252,29 +406,42 @@ class Game:
         if not self.player:
             return
         
+        # Tick the attack cooldown once per step
+        self.player.update()
+
         # Get pressed keys for movement
         keys = pygame.key.get_pressed()
         
         # Handle player input with collision detection
         attack_info = self.player.handle_input(keys, self.environment_objects)
         
-        # Process attacks if any
-        if attack_info:
-            enemies = []  # You'll populate this with actual enemies later
+        # Process attacks if any, enemies are in world space so only attacks from the level's Hero can hit them
+        if attack_info and self.player.attack_handler.hero:
+            enemies = self.current_level.enemies.target_index()
             hits = self.player.attack_handler.process_attack_hits(attack_info, enemies)
-            for hit in hits:
-                print(f"Hit {hit['target']} for {hit['damage']} damage!")
+            for target in hits.targets:
+                EVENTS.emit(HitEvent(target, hits.damage, attack_info['weapon_name']))
         
-        # Update all objects
+        # Update all objects (they expect milliseconds)
         for obj in self.environment_objects:
-            obj.update(self.clock.get_time())
+            obj.update(self.timestep.step * 1000)
+
+        # Advance the level by one fixed step
+        self.current_level.update(self.timestep.step)
+        projectile_hits = self.current_level.projectile_hits
+        for target, damage in zip(projectile_hits.targets, projectile_hits.damage.tolist()):
+            EVENTS.emit(HitEvent(target, damage, "projectile"))
+
+        # On to the next level once this one is cleared, it was prefetched when this one started
+        if self.level_cleared():
+            self.advance_level()
         
         # Check for game over conditions
         # if self.player.health <= 0:
         #     self.current_state = GameState.GAME_OVER
     
-    def draw_gameplay(self):
-        """Draw the gameplay"""
+    def draw_gameplay(self, full=True):
+        """Draw the gameplay, returns the rects that changed (None if the whole screen did)"""
         # Draw background image or solid color
         # if self.background_image_game:
         #     self.screen.blit(self.background_image_game, (0, 0))
@@ -296,41 +463,70 @@ class Game:
         # for obj in self.environment_objects:
         #     obj.draw(self.screen)
 
-        self.current_level.run()
+        # Blend positions between the last two simulation steps for smooth motion
+        return self.current_level.draw(self.timestep.alpha, full)
     
+    # ==================== LOADING ====================
+    def update_loading(self):
+        """Wait for the level on the worker thread, then start playing it"""
+        if self.level_loader.ready(self.current_level_index):
+            self.enter_level()
+
+    def draw_loading(self):
+        """Draw the loading screen with the worker's progress"""
+        job = self.level_loader.request(self.current_level_index)
+
+        loading_y = int(self.screen_height * 0.42)  # 42% from top
+        draw_text(self.screen, self.font, "LOADING", (255, 255, 255), (self.screen_center_x, loading_y))
+
+        # Progress bar (centered, below the title)
+        bar_width = int(self.screen_width * 0.4)
+        bar_height = int(self.screen_height * 0.02)
+        bar_rect = pygame.Rect(0, 0, bar_width, bar_height)
+        bar_rect.center = (self.screen_center_x, loading_y + int(self.screen_height * 0.12))
+        pygame.draw.rect(self.screen, (255, 255, 255), bar_rect.inflate(4, 4), 1)
+        pygame.draw.rect(self.screen, (255, 255, 255), (bar_rect.x, bar_rect.y, int(bar_width * job.progress), bar_height))
+
+        description_y = bar_rect.bottom + int(self.screen_height * 0.05)
+        draw_text(self.screen, self.small_font, job.description, (128, 128, 128), (self.screen_center_x, description_y))
+
     # ==================== PAUSE MENU ====================
+    def pause_game(self):
+        """Freeze the current gameplay frame, the pause menu is drawn over this snapshot"""
+        self.pause_snapshot = None
+        self.current_state = GameState.PAUSED
+
     def handle_pause_events(self, event):
         """Handle pause menu events"""
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
                 self.current_state = GameState.PLAYING
+                self.timestep.reset()
             elif event.key == pygame.K_q:
                 self.current_state = GameState.MAIN_MENU
     
     def draw_pause_menu(self):
         """Draw pause menu over gameplay"""
-        # Draw the game in background (dimmed)
-        self.draw_gameplay()
+        # Draw the game in background (dimmed), frozen as it was when the game was paused
+        if self.pause_snapshot is None or self.pause_snapshot.get_size() != self.screen.get_size():
+            self.draw_gameplay()
+            self.pause_snapshot = self.screen.copy()
+        else:
+            self.screen.blit(self.pause_snapshot, (0, 0))
         
         # Draw semi-transparent overlay
         self.screen.blit(load_semi_transparent_overlay(160), (0, 0))
         
         # Draw pause text (centered)
-        pause_text = self.font.render("PAUSED", True, (255, 255, 255))
         pause_y = int(self.screen_height * 0.42)  # 42% from top
-        pause_rect = pause_text.get_rect(center=(self.screen_center_x, pause_y))
-        self.screen.blit(pause_text, pause_rect)
+        draw_text(self.screen, self.font, "PAUSED", (255, 255, 255), (self.screen_center_x, pause_y))
         
         # Draw instructions (centered, spaced below pause text)
-        resume_text = self.menu_font.render("Press ESC to resume", True, (255, 255, 255))
         resume_y = pause_y + int(self.screen_height * 0.12)  # 12% below pause text
-        resume_rect = resume_text.get_rect(center=(self.screen_center_x, resume_y))
-        self.screen.blit(resume_text, resume_rect)
+        draw_text(self.screen, self.menu_font, "Press ESC to resume", (255, 255, 255), (self.screen_center_x, resume_y))
         
-        quit_text = self.menu_font.render("Press Q to quit to main menu", True, (255, 255, 255))
         quit_y = resume_y + int(self.screen_height * 0.07)  # 7% below resume text
-        quit_rect = quit_text.get_rect(center=(self.screen_center_x, quit_y))
-        self.screen.blit(quit_text, quit_rect)
+        draw_text(self.screen, self.menu_font, "Press Q to quit to main menu", (255, 255, 255), (self.screen_center_x, quit_y))
     
     # ==================== GAME OVER ====================
     def handle_game_over_events(self, event):
@@ -344,23 +540,42 @@ class Game:
     def draw_game_over(self):
         """Draw game over screen"""
         # Draw game over text (centered)
-        game_over_text = self.font.render("GAME OVER", True, (255, 0, 0))
         game_over_y = int(self.screen_height * 0.42)  # 42% from top
-        game_over_rect = game_over_text.get_rect(center=(self.screen_center_x, game_over_y))
-        self.screen.blit(game_over_text, game_over_rect)
+        draw_text(self.screen, self.font, "GAME OVER", (255, 0, 0), (self.screen_center_x, game_over_y))
         
         # Draw restart instructions (centered, spaced below game over text)
-        restart_text = self.menu_font.render("Press SPACE to restart", True, (255, 255, 255))
         restart_y = game_over_y + int(self.screen_height * 0.12)  # 12% below game over text
-        restart_rect = restart_text.get_rect(center=(self.screen_center_x, restart_y))
-        self.screen.blit(restart_text, restart_rect)
+        draw_text(self.screen, self.menu_font, "Press SPACE to restart", (255, 255, 255), (self.screen_center_x, restart_y))
         
-        quit_text = self.menu_font.render("Press Q to quit to main menu", True, (255, 255, 255))
         quit_y = restart_y + int(self.screen_height * 0.07)  # 7% below restart text
-        quit_rect = quit_text.get_rect(center=(self.screen_center_x, quit_y))
-        self.screen.blit(quit_text, quit_rect)
+        draw_text(self.screen, self.menu_font, "Press Q to quit to main menu", (255, 255, 255), (self.screen_center_x, quit_y))
+
+def positive(number_type):
+    """argparse type accepting only numbers above zero"""
+    def parse(text):
+        value = number_type(text)
+        if value <= 0:
+            raise argparse.ArgumentTypeError(f"must be greater than 0, got {text}")
+        return value
+    return parse
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=f"Run {GAME_NAME}")
+    parser.add_argument('--frames', type=positive(int), default=None, help="quit by itself after this many frames")
+    parser.add_argument('--play', action='store_true', help="skip the main menu and start the first level")
+    parser.add_argument('--headless', action='store_true', help="no window, the hero follows the scripted input")
+    parser.add_argument('--profile', choices=PROFILE_MODES, default=None,
+                        help="profile the session with cProfile or a sampling profiler, split per game state")
+    parser.add_argument('--profile-dir', default="profiles", help="where <state>.pstats / <state>.collapsed are written")
+    parser.add_argument('--sample-interval', type=positive(float), default=SAMPLE_INTERVAL * 1000,
+                        help="milliseconds between stack samples in sample mode")
+    return parser.parse_args(argv)
 
 # Run the game
 if __name__ == "__main__":
-    game = Game()
-    game.run()
+    args = parse_args()
+    game = Game(headless=args.headless, input_source=ScriptedInput(DEFAULT_SCRIPT) if args.headless else None)
+    if args.play:
+        game.start_game()
+    session_profiler = args.profile and create_session(args.profile, args.sample_interval / 1000)
+    game.run(args.frames, session_profiler, args.profile_dir)
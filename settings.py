@@ -6,8 +6,28 @@ from Helpers.constants import *
 # Game settings
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
-FPS = 60
+FPS = 60              # Render rate cap, 0 renders as fast as the display allows
+TICK_RATE = 60        # Fixed simulation steps per second, independent of FPS
+MAX_STEPS_PER_FRAME = 5  # Simulation steps a slow frame may catch up on before time is dropped
+BASE_FRAME_RATE = 60  # Frame rate the per-frame movement attributes were tuned at
 
 TILE_SIZE = 8
 SCALE = 3        # Scale factor (8 * 4 = 32 pixel tiles on screen)
 SCALED_TILE_SIZE = TILE_SIZE * SCALE  # 32 - for easy reference
+CHUNK_SIZE = 32  # Static tiles are baked into chunks of CHUNK_SIZE x CHUNK_SIZE tiles
+TILE_ATLAS = True  # Level tiles are subsurfaces of one packed atlas instead of separate surfaces
+SPATIAL_HASH_CELL_SIZE = SCALED_TILE_SIZE * 4  # Bucket size (pixels) for spatially hashed sprite groups
+TEXT_CACHE_SIZE = 128  # Rendered text surfaces kept before the least recently used is evicted
+ASSET_MEMORY_BUDGET = 256 * 1024 * 1024  # Bytes of cached surfaces kept before the least recently used are evicted
+FLOW_FIELD_RADIUS = 48  # Tiles around the hero covered by the enemies' shared flow field
+PATH_CACHE_SIZE = 64  # One-off A* paths kept before the least recently used is evicted
+PROJECTILE_POOL_SIZE = 4096  # Projectiles alive at once, the pool is allocated up front
+EVENT_BUFFER_SIZE = 4096  # Game events held between dispatches before the oldest are dropped
+LOG_RATE_LIMIT = 30  # Log lines written per second, the rest are counted and reported as suppressed
+PROFILER_ENABLED = False  # Time frame phases from the start, otherwise F3 turns the profiler and its overlay on
+PROFILE_HISTORY = 240  # Frames of scope timings kept for the rolling percentiles and the overlay graph
+PROFILE_TRACE_PATH = "frame_trace.json"  # Where F4 writes the Chrome trace (chrome://tracing, Perfetto)
+PROFILE_TRACE_LIMIT = 500_000  # Trace events recorded before recording stops by itself
+STATIC_SCREEN_WAIT = 250  # Longest (ms) an unchanged menu/pause/game over screen sleeps waiting for input
+DIRTY_RECTS = True  # While the camera holds still, gameplay only redraws and pushes the areas moving things cover
+DIRTY_AREA_THRESHOLD = 0.35  # Fraction of the screen dirty past which a full redraw and flip are used instead
@@ -0,0 +1,38 @@
+import time
+from settings import *
+from main import Game
+
+class HeldKeys:
+    """pygame.key.get_pressed() stand-in with only the given keys down"""
+    def __init__(self, *keys):
+        self.keys = set(keys)
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+def playing_game():
+    """Headless game past the loading screen, playing the first level"""
+    game = Game(headless=True)
+    while not game.level_loader.ready(game.current_level_index):
+        time.sleep(0.01)
+    game.start_game()
+    assert game.current_state.value == "playing"
+    return game
+
+def test_held_attack_fires_again_after_cooldown(monkeypatch):
+    game = playing_game()
+    game.player.equip_weapon('bow')
+    projectiles = game.current_level.projectiles
+
+    fired = []
+    spawn = projectiles.spawn
+    monkeypatch.setattr(projectiles, 'spawn', lambda *args: fired.append(spawn(*args)) or fired[-1])
+    monkeypatch.setattr(pygame.key, 'get_pressed', lambda: HeldKeys(pygame.K_SPACE))
+
+    cooldown = game.player.get_current_weapon().cooldown
+    for _ in range(cooldown * 3):
+        game.update_gameplay()
+
+    # One shot per cooldown while attack is held, not one per session
+    assert len(fired) == 3
+    assert all(slot >= 0 for slot in fired)